@@ -12,7 +12,7 @@ pip install -e ".[dev]"
 
 # Run the test script
 echo "Running test script..."
-python test_xtract.py
+python scripts/smoke_xtract.py
 
 echo "Installation complete! You can activate the virtual environment with:"
 echo "source .venv/bin/activate" 
\ No newline at end of file
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
-Test script to verify the xtract package works correctly.
+Smoke test that downloads a real post to verify the xtract package works.
+
+This hits x.com over the network, so it lives outside tests/ and is run by hand:
+    python scripts/smoke_xtract.py
 """
 
 from xtract import download_x_post
@@ -36,6 +36,9 @@ setup(
         "idna>=3.4",
     ],
     extras_require={
+        "speedups": [
+            "orjson>=3.10",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
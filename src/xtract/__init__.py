@@ -4,10 +4,10 @@ xtract - A library for extracting data from X (formerly Twitter) posts.
 
 import logging
 from xtract.config.logging import configure_logging
-from xtract.api.client import download_x_post
+from xtract.api.client import download_x_post, download_x_posts
 from xtract.models.post import Post, PostData
 from xtract.models.user import UserDetails
-from xtract.utils.markdown import post_to_markdown, save_post_as_markdown
+from xtract.utils.markdown import post_to_markdown, save_post_as_markdown, save_posts_as_markdown
 
 __version__ = "1.3.0"
 
@@ -20,9 +20,11 @@ logger.debug("xtract package initialized")
 
 __all__ = [
     "download_x_post",
+    "download_x_posts",
     "Post",
     "PostData",
     "UserDetails",
     "post_to_markdown",
     "save_post_as_markdown",
+    "save_posts_as_markdown",
 ]
@@ -2,7 +2,12 @@
 API module for interacting with X's APIs.
 """
 
-from xtract.api.client import get_guest_token, fetch_tweet_data, download_x_post
+from xtract.api.client import (
+    get_guest_token,
+    fetch_tweet_data,
+    download_x_post,
+    download_x_posts,
+)
 from xtract.api.errors import APIError
 
-__all__ = ["get_guest_token", "fetch_tweet_data", "download_x_post", "APIError"]
+__all__ = ["get_guest_token", "fetch_tweet_data", "download_x_post", "download_x_posts", "APIError"]
@@ -2,27 +2,55 @@
 Client for interacting with X's API.
 """
 
+import logging
 import os
-import json
+import re
 import requests
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlencode
 
 from xtract.api.errors import APIError, TokenExpiredError
 from xtract.config.constants import (
-    DEFAULT_HEADERS,
     GUEST_TOKEN_URL,
     TWEET_DATA_URL,
     DEFAULT_FEATURES,
     DEFAULT_FIELD_TOGGLES,
+    REQUEST_TIMEOUT,
 )
 from xtract.config.logging import get_logger
+from xtract.config.session import SESSION
 from xtract.models.post import Post
-from xtract.utils.file import save_json, ensure_directory
+from xtract.utils.file import save_json, save_post_json, ensure_directory
+from xtract.utils.serialization import dumps, loads
 
 # Get a logger for this module
 logger = get_logger(__name__)
 
+# Guest tokens already loaded or fetched in this process, keyed by cache file path
+_guest_tokens: Dict[str, str] = {}
+
+# Tweet ID in a post URL like "https://x.com/username/status/1234567890"
+_TWEET_ID_RE = re.compile(r"status/(\d+)")
+
+# The feature flags and field toggles never change, so their part of the query
+# string is encoded only once
+_STATIC_QUERY = urlencode(
+    {
+        "features": dumps(DEFAULT_FEATURES).decode("utf-8"),
+        "fieldToggles": dumps(DEFAULT_FIELD_TOGGLES).decode("utf-8"),
+    }
+)
+
+
+@lru_cache(maxsize=8)
+def _token_cache_path(token_cache_dir: str, token_cache_filename: str) -> str:
+    """Join the guest token cache directory and filename, once per pair."""
+    return os.path.join(token_cache_dir, token_cache_filename)
+
 
 def get_guest_token(
     token_cache_dir: str = "/tmp/xtract/",
@@ -32,6 +60,9 @@ def get_guest_token(
     """
     Fetch a guest token from X's API or retrieve from cache.
 
+    Tokens are also remembered in memory, so later calls in the same process skip
+    the cache file until the token is invalidated or force_refresh is set.
+
     Args:
         token_cache_dir: Directory to cache the guest token (default: "/tmp/xtract/")
         token_cache_filename: Filename for the token cache (default: "guest_token.json")
@@ -43,37 +74,62 @@ def get_guest_token(
     Raises:
         APIError: If the API request fails
     """
+    token_file_path = _token_cache_path(token_cache_dir, token_cache_filename)
+
+    # A token seen earlier in this process needs no disk access
+    if not force_refresh and token_file_path in _guest_tokens:
+        logger.debug("Using guest token already loaded in this process")
+        return _guest_tokens[token_file_path]
+
     # Ensure cache directory exists
     ensure_directory(token_cache_dir)
-    token_file_path = os.path.join(token_cache_dir, token_cache_filename)
 
     # Check if cached token exists and we're not forcing a refresh
     if not force_refresh and os.path.exists(token_file_path):
         try:
-            with open(token_file_path, "r") as f:
-                token_data = json.load(f)
+            with open(token_file_path, "rb") as f:
+                token_data = loads(f.read())
                 token = token_data.get("token")
                 logger.info("Retrieved guest token from cache. Token: %s", token)
+                if token:
+                    _guest_tokens[token_file_path] = token
                 return token
-        except (json.JSONDecodeError, IOError) as e:
+        except (ValueError, IOError) as e:
             logger.warning(f"Failed to read cached token: {e}")
             # Continue to fetch a new token
     elif force_refresh:
         logger.info("Forcing token refresh, fetching new token")
 
-    # Fetch new token
-    headers = DEFAULT_HEADERS.copy()
+    # Fetch new token; the session already sends DEFAULT_HEADERS
     logger.debug("Requesting guest token from X API")
     try:
-        response = requests.post(GUEST_TOKEN_URL, headers=headers)
+        response = SESSION.post(GUEST_TOKEN_URL, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        token = response.json().get("guest_token")
+        token = loads(response.content).get("guest_token")
         logger.info("Successfully obtained guest token. Token: %s", token)
+        if token:
+            _guest_tokens[token_file_path] = token
 
-        # Save token to cache
+        # Save token to cache. Writing a temporary file and renaming it over the
+        # cache means a crash mid-write never leaves a truncated cache behind.
+        # Each call gets its own temporary file, so concurrent refreshes from
+        # download_x_posts workers cannot interleave their writes.
         try:
-            with open(token_file_path, "w") as f:
-                json.dump({"token": token, "timestamp": datetime.now().isoformat()}, f)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(token_file_path),
+                prefix=token_cache_filename + ".",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(dumps({"token": token, "timestamp": datetime.now().isoformat()}))
+                os.replace(tmp_path, token_file_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
             logger.debug(f"Saved guest token to cache: {token_file_path}")
         except IOError as e:
             logger.warning(f"Failed to cache token: {e}")
@@ -82,6 +138,9 @@ def get_guest_token(
     except requests.RequestException as e:
         logger.error(f"Failed to fetch guest token: {e}")
         raise APIError(f"Failed to fetch guest token: {e}")
+    except ValueError as e:
+        logger.error(f"Invalid guest token response: {e}")
+        raise APIError(f"Invalid guest token response: {e}")
 
 
 def invalidate_guest_token(
@@ -94,7 +153,8 @@ def invalidate_guest_token(
         token_cache_dir: Directory where the token is cached (default: "/tmp/xtract/")
         token_cache_filename: Filename for the token cache (default: "guest_token.json")
     """
-    token_file_path = os.path.join(token_cache_dir, token_cache_filename)
+    token_file_path = _token_cache_path(token_cache_dir, token_cache_filename)
+    _guest_tokens.pop(token_file_path, None)
     if os.path.exists(token_file_path):
         try:
             os.remove(token_file_path)
@@ -119,39 +179,58 @@ def fetch_tweet_data(tweet_id: str, headers: Dict[str, str]) -> Dict[str, Any]:
         APIError: If the API request fails for other reasons
     """
     logger.debug(f"Preparing to fetch data for tweet ID: {tweet_id}")
-    params = {
-        "variables": json.dumps(
-            {
-                "tweetId": tweet_id,
-                "withCommunity": False,
-                "includePromotedContent": False,
-                "withVoice": False,
-            }
-        ),
-        "features": json.dumps(DEFAULT_FEATURES),
-        "fieldToggles": json.dumps(DEFAULT_FIELD_TOGGLES),
-    }
+    variables = dumps(
+        {
+            "tweetId": tweet_id,
+            "withCommunity": False,
+            "includePromotedContent": False,
+            "withVoice": False,
+        }
+    ).decode("utf-8")
+    url = f"{TWEET_DATA_URL}?{urlencode({'variables': variables})}&{_STATIC_QUERY}"
     try:
         logger.debug(f"Sending request to {TWEET_DATA_URL}")
-        response = requests.get(TWEET_DATA_URL, headers=headers, params=params)
+        response = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
 
-        # Check specifically for 403 errors which typically indicate token expiration
+        # Check specifically for 403 errors which typically indicate token expiration.
+        # The status code is enough; the error body is only decoded for debug logging.
         if response.status_code == 403:
-            error_msg = (
-                f"Token expired or invalid (403 Forbidden) for tweet {tweet_id}: {response.text}"
-            )
+            error_msg = f"Token expired or invalid (403 Forbidden) for tweet {tweet_id}"
             logger.warning(error_msg)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("403 response body for tweet %s: %s", tweet_id, response.text)
             raise TokenExpiredError(error_msg)
 
         response.raise_for_status()
         logger.debug(f"Successfully received response for tweet ID: {tweet_id}")
-        return response.json()
+        # Parse the raw bytes directly instead of decoding the body to text first
+        return loads(response.content)
     except requests.HTTPError as e:
         logger.error(f"HTTP error fetching tweet {tweet_id}: {e}")
         raise APIError(f"HTTP error fetching tweet {tweet_id}: {e}")
     except requests.RequestException as e:
         logger.error(f"Failed to fetch tweet {tweet_id}: {e}")
         raise APIError(f"Failed to fetch tweet {tweet_id}: {e}")
+    except ValueError as e:
+        logger.error(f"Invalid JSON in response for tweet {tweet_id}: {e}")
+        raise APIError(f"Invalid JSON in response for tweet {tweet_id}: {e}")
+
+
+def _build_post(data: Dict[str, Any]) -> Post:
+    """
+    Create a Post from a TweetResultByRestId response.
+
+    Args:
+        data: Parsed response from fetch_tweet_data
+
+    Returns:
+        Post: Populated instance
+    """
+    tweet = data.get("data", {}).get("tweetResult", {}).get("result", {})
+    legacy = tweet.get("legacy", {})
+    user = tweet.get("core", {}).get("user_results", {}).get("result", {}).get("legacy", {})
+    note_tweet = tweet.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
+    return Post.from_api_data(tweet, legacy, user, note_tweet)
 
 
 def fetch_quoted_tweets_recursively(
@@ -211,21 +290,8 @@ def fetch_quoted_tweets_recursively(
                 # Fetch the quoted tweet data
                 data = fetch_tweet_data(post.quoted_tweet_id, headers)
 
-                # Parse the response
-                tweet = data.get("data", {}).get("tweetResult", {}).get("result", {})
-                legacy = tweet.get("legacy", {})
-                user = (
-                    tweet.get("core", {})
-                    .get("user_results", {})
-                    .get("result", {})
-                    .get("legacy", {})
-                )
-                note_tweet = (
-                    tweet.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
-                )
-
                 # Create Post object for the quoted tweet
-                post.quoted_tweet = Post.from_api_data(tweet, legacy, user, note_tweet)
+                post.quoted_tweet = _build_post(data)
                 logger.info(f"Successfully fetched quoted tweet: {post.quoted_tweet_id}")
 
                 # Recursively fetch any quoted tweets in this quoted tweet
@@ -274,6 +340,20 @@ def fetch_quoted_tweets_recursively(
     return post
 
 
+def _extract_tweet_id(post_identifier: str) -> str:
+    """
+    Extract the tweet ID from a post URL.
+
+    Args:
+        post_identifier: Either a tweet ID or a URL like "https://x.com/username/status/1234567890"
+
+    Returns:
+        str: The numeric ID following "status/", or post_identifier unchanged if there is none
+    """
+    match = _TWEET_ID_RE.search(post_identifier)
+    return match.group(1) if match else post_identifier
+
+
 def download_x_post(
     post_identifier: str,
     output_dir: str = None,
@@ -304,12 +384,8 @@ def download_x_post(
     logger.info(f"Processing post identifier: {post_identifier}")
 
     # Extract tweet ID from URL if a URL is provided
-    tweet_id = post_identifier
-    if "/" in post_identifier and "status" in post_identifier:
-        # Extract ID from URL like "https://x.com/username/status/1234567890"
-        tweet_id = post_identifier.split("status/")[1].split("/")[0].split("?")[0]
-        # Remove any non-numeric characters (in case of trailing text)
-        tweet_id = "".join(c for c in tweet_id if c.isdigit())
+    tweet_id = _extract_tweet_id(post_identifier)
+    if tweet_id != post_identifier:
         logger.info(f"Extracted tweet ID '{tweet_id}' from URL")
 
     # Only setup directory if we're saving files
@@ -330,8 +406,15 @@ def download_x_post(
     retries = 0
     force_refresh = False
 
+    # Build the headers once; retries only swap in a fresh guest token. The session
+    # already sends DEFAULT_HEADERS, so only the per-download auth headers go here.
+    headers: Dict[str, str] = {}
+    if cookies:
+        logger.info("Using provided cookies for authentication")
+        headers["Cookie"] = cookies
+        print("Using provided cookies")
+
     while retries < max_retries:
-        headers = DEFAULT_HEADERS.copy()
         if not cookies:
             try:
                 logger.debug(
@@ -348,10 +431,6 @@ def download_x_post(
                 logger.error(f"Failed to get guest token: {e}")
                 print(e)
                 return None
-        else:
-            logger.info("Using provided cookies for authentication")
-            headers["Cookie"] = cookies
-            print("Using provided cookies")
 
         print(f"Fetching data for tweet ID: {tweet_id}")
         logger.info(f"Fetching data for tweet ID: {tweet_id}")
@@ -379,14 +458,8 @@ def download_x_post(
             return None
 
     # Process the tweet data
-    logger.debug("Processing retrieved tweet data")
-    tweet = data.get("data", {}).get("tweetResult", {}).get("result", {})
-    legacy = tweet.get("legacy", {})
-    user = tweet.get("core", {}).get("user_results", {}).get("result", {}).get("legacy", {})
-    note_tweet = tweet.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
-
     logger.debug("Creating Post object from API data")
-    post = Post.from_api_data(tweet, legacy, user, note_tweet)
+    post = _build_post(data)
 
     # Recursively fetch quoted tweets if enabled
     if fetch_quoted_tweets:
@@ -399,14 +472,63 @@ def download_x_post(
         # Save raw response
         raw_file = os.path.join(tweet_dir, "raw_response.json")
         logger.debug(f"Saving raw response to: {raw_file}")
-        save_json(data, raw_file)
+        # The raw response is large and rarely read by hand, so it is written compactly
+        save_json(data, raw_file, pretty=False)
         print(f"Raw response saved to: {raw_file}")
 
         # Save structured tweet data
         json_file = os.path.join(tweet_dir, "tweet.json")
         logger.debug(f"Saving structured JSON to: {json_file}")
-        save_json(post.to_dict(), json_file)
+        save_post_json(post, json_file)
         print(f"Structured JSON saved to: {json_file}")
 
     logger.info(f"Successfully downloaded and processed tweet ID: {tweet_id}")
     return post
+
+
+def download_x_posts(
+    post_identifiers: List[str], max_workers: int = 4, **kwargs: Any
+) -> List[Optional[Post]]:
+    """
+    Download several X (Twitter) posts concurrently.
+
+    Each post is downloaded with download_x_post on a worker thread. The requests are
+    I/O-bound, so overlapping them cuts the total wall time from one round trip per
+    post to roughly one round trip per batch of max_workers posts.
+
+    Unless cookies are given, one guest token is fetched up front and shared by
+    every download.
+
+    Args:
+        post_identifiers: Tweet IDs or URLs to download
+        max_workers: Maximum number of posts to download at the same time (default: 4)
+        **kwargs: Additional keyword arguments passed to download_x_post
+
+    Returns:
+        List of Post objects (or None for failed downloads), in the same order as
+        post_identifiers
+    """
+    logger.info(f"Downloading {len(post_identifiers)} posts with up to {max_workers} workers")
+
+    if not kwargs.get("cookies") and len(post_identifiers) > 1:
+        # Fetch the guest token once before fanning out, so the workers all find it
+        # in memory instead of racing to request their own
+        try:
+            get_guest_token(
+                kwargs.get("token_cache_dir", "/tmp/xtract/"),
+                kwargs.get("token_cache_filename", "guest_token.json"),
+            )
+        except APIError as e:
+            # Each download reports its own failure
+            logger.warning(f"Failed to prefetch guest token: {e}")
+
+    def download(identifier: str) -> Optional[Post]:
+        # One failing post must not discard the rest of the batch
+        try:
+            return download_x_post(identifier, **kwargs)
+        except Exception:
+            logger.exception(f"Failed to download post {identifier}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(download, post_identifiers))
@@ -3,7 +3,6 @@ Command-line interface for the xtract library.
 """
 
 import argparse
-import json
 import sys
 import os
 import logging
@@ -16,37 +15,53 @@ from xtract.utils.markdown import save_post_as_markdown
 logger = get_logger(__name__)
 
 
+# Help strings are only handed to argparse when --help is actually requested
+_DESCRIPTION = "Download content from X posts"
+_HELP_TEXT = {
+    "tweet_id": "X post ID or URL (e.g., 1892413385804792307 or https://x.com/username/status/1892413385804792307)",
+    "output_dir": "Directory to save downloaded content",
+    "cookies": "Cookies for authentication (optional)",
+    "save_raw": "Save raw API response",
+    "pretty": "Pretty-print JSON output to console",
+    "markdown": "Generate a Markdown file of the post",
+    "verbose": "Enable verbose logging output",
+    "no_recursive_quotes": "Disable recursive fetching of quoted tweets (default: enabled)",
+}
+
+
+def _is_help_flag(arg: str) -> bool:
+    """Return whether argparse would treat arg as -h/--help, including abbreviations."""
+    return arg == "-h" or (arg.startswith("--h") and "--help".startswith(arg))
+
+
 def main():
     """Main entry point for the CLI."""
-    parser = argparse.ArgumentParser(description="Download content from X posts")
-    parser.add_argument(
-        "tweet_id",
-        help="X post ID or URL (e.g., 1892413385804792307 or https://x.com/username/status/1892413385804792307)",
-    )
+    want_help = any(_is_help_flag(arg) for arg in sys.argv[1:])
+    help_text = _HELP_TEXT if want_help else {}
+
+    parser = argparse.ArgumentParser(description=_DESCRIPTION if want_help else None)
+    parser.add_argument("tweet_id", help=help_text.get("tweet_id"))
     parser.add_argument(
-        "--output-dir", default="x_post_downloads", help="Directory to save downloaded content"
+        "--output-dir", default="x_post_downloads", help=help_text.get("output_dir")
     )
-    parser.add_argument("--cookies", help="Cookies for authentication (optional)")
+    parser.add_argument("--cookies", help=help_text.get("cookies"))
     parser.add_argument(
-        "--save-raw", action="store_true", default=True, help="Save raw API response"
+        "--save-raw", action="store_true", default=True, help=help_text.get("save_raw")
     )
     parser.add_argument(
-        "--pretty", action="store_true", default=False, help="Pretty-print JSON output to console"
+        "--pretty", action="store_true", default=False, help=help_text.get("pretty")
     )
     parser.add_argument(
-        "--markdown",
-        action="store_true",
-        default=False,
-        help="Generate a Markdown file of the post",
+        "--markdown", action="store_true", default=False, help=help_text.get("markdown")
     )
     parser.add_argument(
-        "--verbose", action="store_true", default=False, help="Enable verbose logging output"
+        "--verbose", action="store_true", default=False, help=help_text.get("verbose")
     )
     parser.add_argument(
         "--no-recursive-quotes",
         action="store_true",
         default=False,
-        help="Disable recursive fetching of quoted tweets (default: enabled)",
+        help=help_text.get("no_recursive_quotes"),
     )
 
     args = parser.parse_args()
@@ -86,7 +101,8 @@ def main():
             if args.pretty:
                 logger.debug("Pretty-printing JSON output")
                 print("\nResulting JSON:")
-                print(json.dumps(post.to_dict(), indent=2))
+                post.write_json(sys.stdout, indent=2)
+                print()
             else:
                 print("Download completed successfully!")
 
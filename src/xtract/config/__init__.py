@@ -11,7 +11,9 @@ from xtract.config.constants import (
     DEFAULT_FEATURES,
     DEFAULT_FIELD_TOGGLES,
     DEFAULT_OUTPUT_DIR,
+    REQUEST_TIMEOUT,
 )
+from xtract.config.session import SESSION
 
 # Create a logger for this module
 logger = get_logger(__name__)
@@ -25,4 +27,6 @@ __all__ = [
     "DEFAULT_FEATURES",
     "DEFAULT_FIELD_TOGGLES",
     "DEFAULT_OUTPUT_DIR",
+    "REQUEST_TIMEOUT",
+    "SESSION",
 ]
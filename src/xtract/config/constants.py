@@ -76,6 +76,9 @@ DEFAULT_FIELD_TOGGLES = {
     "withDisallowedReplyControls": False,
 }
 
+# (connect, read) timeout in seconds for API requests, so a stalled connection cannot hang
+REQUEST_TIMEOUT = (3.05, 27)
+
 # Default output directory
 DEFAULT_OUTPUT_DIR = "x_post_downloads"
 
@@ -9,25 +9,36 @@ import sys
 DEFAULT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 DEBUG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s (%(filename)s:%(lineno)d): %(message)s"
 
+# Handler installed on the root logger by configure_logging, if any
+_stream_handler = None
+
 
 # Set up the basic configuration
 def configure_logging(level=logging.INFO, log_format=None):
     """
     Configure the logging for the xtract package.
 
+    Records are written synchronously to stdout, the same stream the CLI prints
+    to, so log lines and printed output appear in the order they were produced.
+
     Args:
         level: The logging level to use (default: INFO)
         log_format: The format string to use for log messages
     """
+    global _stream_handler
+
     if log_format is None:
         log_format = DEBUG_FORMAT if level <= logging.DEBUG else DEFAULT_FORMAT
 
-    # Configure the root logger
-    logging.basicConfig(
-        level=level,
-        format=log_format,
-        stream=sys.stdout,
-    )
+    # Like logging.basicConfig, only install a handler if the root logger has none
+    root = logging.getLogger()
+    if _stream_handler is None and not root.handlers:
+        _stream_handler = logging.StreamHandler(sys.stdout)
+        root.addHandler(_stream_handler)
+        root.setLevel(level)
+
+    if _stream_handler is not None:
+        _stream_handler.setFormatter(logging.Formatter(log_format))
 
     # Set the level for the xtract package
     logging.getLogger("xtract").setLevel(level)
@@ -0,0 +1,19 @@
+"""
+Shared HTTP session for talking to X's APIs.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from xtract.config.constants import DEFAULT_HEADERS
+from xtract.config.logging import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# One pooled session so the guest token and tweet data requests reuse the same connection
+SESSION = requests.Session()
+SESSION.headers.update(DEFAULT_HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+
+logger.debug("HTTP session initialized")
@@ -0,0 +1,9 @@
+"""
+Compatibility helpers for the data models.
+"""
+
+import sys
+
+# dataclass(slots=True) is only available on Python 3.10+; older interpreters
+# fall back to regular dataclasses with an instance __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -2,17 +2,141 @@
 Models for post data from X.
 """
 
+import json
+import logging
+import sys
 from dataclasses import dataclass
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import IO, Dict, List, Any, Optional
 
 from xtract.config.logging import get_logger
+from xtract.models._compat import DATACLASS_SLOTS
 from xtract.models.user import UserDetails
+from xtract.utils.media import extract_media_urls
+from xtract.utils.text import expand_urls
 
 # Get a logger for this module
 logger = get_logger(__name__)
 
 
-@dataclass
+# Month numbers and weekday names used in X timestamps
+_MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+
+
+@lru_cache(maxsize=4096)
+def _parse_created_at(created_at: str) -> Optional[datetime]:
+    """
+    Parse an X timestamp such as "Wed Feb 28 12:00:00 +0000 2024", or return None.
+
+    X always emits fixed-width timestamps, so the fields are sliced out directly
+    and the datetime constructor range-checks them. Anything that does not look
+    like one, or has a field out of range, falls back to strptime, so the result
+    always matches what strptime would accept. Results are cached since posts
+    fetched together often share a timestamp.
+    """
+    # Fast path: "Wed Feb 28 12:00:00 +0000 2024"
+    if (
+        isinstance(created_at, str)
+        and len(created_at) == 30
+        and created_at[3] == created_at[7] == created_at[10] == " "
+        and created_at[19] == created_at[25] == " "
+        and created_at[13] == created_at[16] == ":"
+        and created_at[20] in "+-"
+        and created_at[:3] in _WEEKDAYS
+    ):
+        month = _MONTHS.get(created_at[4:7])
+        digits = (
+            created_at[8:10]
+            + created_at[11:13]
+            + created_at[14:16]
+            + created_at[17:19]
+            + created_at[21:25]
+            + created_at[26:30]
+        )
+        if month and digits.isascii() and digits.isdigit() and int(created_at[23:25]) < 60:
+            offset = timedelta(hours=int(created_at[21:23]), minutes=int(created_at[23:25]))
+            try:
+                return datetime(
+                    int(created_at[26:30]),
+                    month,
+                    int(created_at[8:10]),
+                    int(created_at[11:13]),
+                    int(created_at[14:16]),
+                    int(created_at[17:19]),
+                    tzinfo=timezone(-offset if created_at[20] == "-" else offset),
+                )
+            except ValueError:
+                pass
+
+    try:
+        return datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+    except (ValueError, TypeError):
+        return None
+
+
+def _log_debug_details(
+    post: "Post",
+    note_tweet: Dict[str, Any],
+    media_items: List[Dict[str, Any]],
+    url_entities: List[Dict[str, Any]],
+    quoted: Optional[Dict[str, Any]],
+    quoted_tweet_id: Optional[str],
+) -> None:
+    """Log how Post.from_api_data built post. Only called when DEBUG is enabled."""
+    logger.debug("Created Post from API data for tweet ID: %s", post.tweet_id)
+    if note_tweet.get("text"):
+        logger.debug("Using text from note_tweet (longer form content)")
+        if note_tweet.get("entity_set", {}).get("urls"):
+            logger.debug("Using URL entities from note_tweet entity_set")
+    if media_items:
+        logger.debug("Found %d media items with potential t.co URLs", len(media_items))
+        for media in media_items:
+            if media.get("url") and media.get("media_url_https"):
+                logger.debug(
+                    "Added media URL for expansion: %s -> %s",
+                    media["url"],
+                    media["media_url_https"],
+                )
+    if url_entities:
+        logger.debug("Found %d URL entities to expand", len(url_entities))
+
+    if quoted_tweet_id is not None:
+        logger.debug("Found quoted_status_id_str in legacy: %s", quoted_tweet_id)
+    if quoted:
+        # quotedRefResult is used for nested quotes with limited data
+        nested_quoted = quoted.get("quotedRefResult", {}).get("result", {})
+        if nested_quoted and "rest_id" in nested_quoted:
+            logger.debug(
+                "Found nested quoted tweet ID via quotedRefResult: %s", nested_quoted["rest_id"]
+            )
+        if "legacy" in quoted:
+            logger.debug(
+                "Found quoted tweet with full data, ID: %s", quoted.get("rest_id", "unknown")
+            )
+        elif quoted.get("rest_id"):
+            logger.debug("Found quoted tweet with only ID: %s", quoted["rest_id"])
+    elif quoted_tweet_id:
+        logger.debug(
+            "Have quoted tweet ID from legacy but no quoted status result: %s", quoted_tweet_id
+        )
+
+
+@dataclass(**DATACLASS_SLOTS)
 class PostData:
     """Class to represent post metadata and analytics."""
 
@@ -49,16 +173,39 @@ class PostData:
             quote_count=legacy.get("quote_count", 0),
             bookmark_count=legacy.get("bookmark_count", 0),
             is_quote_status=legacy.get("is_quote_status", False),
-            lang=legacy.get("lang", ""),
-            source=tweet.get("source", ""),
+            # Languages and client sources repeat across posts, so share one copy of each
+            lang=sys.intern(legacy.get("lang", "") or ""),
+            source=sys.intern(tweet.get("source", "") or ""),
             possibly_sensitive=legacy.get("possibly_sensitive", False),
             conversation_id=legacy.get("conversation_id_str", ""),
             is_translatable=tweet.get("is_translatable", False),
             grok_analysis_button=tweet.get("grok_analysis_button", False),
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the PostData to a dictionary.
+
+        Returns:
+            Dict[str, Any]: Dictionary representation of the post metadata
+        """
+        return {
+            "favorite_count": self.favorite_count,
+            "retweet_count": self.retweet_count,
+            "reply_count": self.reply_count,
+            "quote_count": self.quote_count,
+            "bookmark_count": self.bookmark_count,
+            "is_quote_status": self.is_quote_status,
+            "lang": self.lang,
+            "source": self.source,
+            "possibly_sensitive": self.possibly_sensitive,
+            "conversation_id": self.conversation_id,
+            "is_translatable": self.is_translatable,
+            "grok_analysis_button": self.grok_analysis_button,
+        }
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Post:
     """Class to represent an X post, including optional quoted post."""
 
@@ -74,6 +221,19 @@ class Post:
     quoted_tweet: Optional["Post"] = None
     quoted_tweet_id: Optional[str] = None
 
+    @property
+    def created_at_datetime(self) -> Optional[datetime]:
+        """
+        The creation time as a timezone-aware datetime.
+
+        Parsed values are cached per timestamp string, so sorting or filtering
+        posts by date does not re-run strptime on every access.
+
+        Returns:
+            Optional[datetime]: The parsed time, or None if created_at is not in X's format
+        """
+        return _parse_created_at(self.created_at)
+
     @classmethod
     def from_api_data(
         cls,
@@ -94,18 +254,9 @@ class Post:
         Returns:
             Post: Populated instance
         """
-        from xtract.utils.media import extract_media_urls
-        from xtract.utils.text import expand_urls
-
-        logger.debug(f"Creating Post from API data for tweet ID: {tweet.get('rest_id', 'unknown')}")
-
-        logger.debug("Extracting media URLs from extended entities")
-        images, videos = extract_media_urls(legacy.get("extended_entities", {}).get("media", []))
-
-        logger.debug("Creating UserDetails from user data")
+        media_items = legacy.get("extended_entities", {}).get("media", [])
+        images, videos = extract_media_urls(media_items)
         user_details = UserDetails.from_dict(user)
-
-        logger.debug("Creating PostData from tweet and legacy data")
         post_data = PostData.from_dict(tweet, legacy)
 
         # Check for note tweet (longer form content)
@@ -113,20 +264,18 @@ class Post:
         url_entities = legacy.get("entities", {}).get("urls", [])
 
         if note_tweet.get("text"):
-            logger.debug("Using text from note_tweet (longer form content)")
             text = note_tweet.get("text", "")
             # Use URL entities from note_tweet entity_set if available
             note_urls = note_tweet.get("entity_set", {}).get("urls", [])
             if note_urls:
-                logger.debug("Using URL entities from note_tweet entity_set")
                 url_entities = note_urls
 
         # Add media URLs to url_entities (media t.co links also need expansion)
         # Media URLs are in extended_entities.media, not in entities.urls
         # Replace t.co links with direct media URLs (media_url_https) instead of expanded_url
-        media_items = legacy.get("extended_entities", {}).get("media", [])
         if media_items:
-            logger.debug(f"Found {len(media_items)} media items with potential t.co URLs")
+            # Copy so the caller's API data is not modified
+            url_entities = list(url_entities)
             for media in media_items:
                 media_url = media.get("url")
                 media_url_https = media.get("media_url_https")
@@ -134,12 +283,10 @@ class Post:
                     # Add media URL to entities list for expansion
                     # Use media_url_https (direct media file) instead of expanded_url (permalink)
                     url_entities.append({"url": media_url, "expanded_url": media_url_https})
-                    logger.debug(f"Added media URL for expansion: {media_url} -> {media_url_https}")
 
         # Expand t.co URLs to their original form
         try:
             if url_entities:
-                logger.debug(f"Found {len(url_entities)} URL entities to expand")
                 text = expand_urls(text, url_entities)
         except Exception as e:
             logger.warning(f"Failed to expand URLs for tweet {tweet.get('rest_id')}: {e}")
@@ -158,36 +305,22 @@ class Post:
 
         # Handle quoted tweet if present - check multiple possible locations
         quoted = None
-        quoted_tweet_id = None
-
-        # Check in the tweet object (this is where it should be for most APIs)
-        if "quoted_status_result" in tweet:
-            quoted = tweet.get("quoted_status_result", {}).get("result", {})
-        # Check in the legacy object as a fallback (older API responses may put it here)
-        elif "quoted_status_result" in legacy:
-            quoted = legacy.get("quoted_status_result", {}).get("result", {})
-
-        # Also check for quotedRefResult (used for nested quotes with limited data)
-        if quoted and "quotedRefResult" in quoted:
-            nested_quoted = quoted.get("quotedRefResult", {}).get("result", {})
-            # Store the nested quoted tweet ID from quotedRefResult
-            if nested_quoted and "rest_id" in nested_quoted:
-                logger.debug(
-                    f"Found nested quoted tweet ID via quotedRefResult: {nested_quoted.get('rest_id')}"
-                )
+
+        # Check in the tweet object (this is where it should be for most APIs), then in
+        # the legacy object as a fallback (older API responses may put it here)
+        quoted_status = tweet.get("quoted_status_result")
+        if quoted_status is None:
+            quoted_status = legacy.get("quoted_status_result")
+        if quoted_status is not None:
+            quoted = quoted_status.get("result", {})
 
         # Extract quoted tweet ID from legacy if available
-        if "quoted_status_id_str" in legacy:
-            quoted_tweet_id = legacy.get("quoted_status_id_str")
-            logger.debug(f"Found quoted_status_id_str in legacy: {quoted_tweet_id}")
+        quoted_tweet_id = legacy.get("quoted_status_id_str")
 
         # Process quoted tweet if we have full data
         if quoted:
             # Check if we have full data (has legacy field) or just an ID
             if "legacy" in quoted:
-                logger.debug(
-                    f"Found quoted tweet with full data, ID: {quoted.get('rest_id', 'unknown')}"
-                )
                 quoted_legacy = quoted.get("legacy", {})
                 quoted_user = (
                     quoted.get("core", {})
@@ -207,16 +340,14 @@ class Post:
                 # Only have ID, no full data
                 quoted_id = quoted.get("rest_id")
                 if quoted_id:
-                    logger.debug(f"Found quoted tweet with only ID: {quoted_id}")
                     post.quoted_tweet_id = quoted_id
         elif quoted_tweet_id:
             # Have ID from legacy but no quoted status result
-            logger.debug(
-                f"Have quoted tweet ID from legacy but no quoted status result: {quoted_tweet_id}"
-            )
             post.quoted_tweet_id = quoted_tweet_id
 
-        logger.debug(f"Successfully created Post object for tweet ID: {post.tweet_id}")
+        # All diagnostics are gathered here, so none of the work above pays for them
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_debug_details(post, note_tweet, media_items, url_entities, quoted, quoted_tweet_id)
         return post
 
     def to_dict(self) -> Dict[str, Any]:
@@ -226,7 +357,9 @@ class Post:
         Returns:
             Dict[str, Any]: Dictionary representation of the Post
         """
-        logger.debug(f"Converting Post to dictionary for tweet ID: {self.tweet_id}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"Converting Post to dictionary for tweet ID: {self.tweet_id}")
         result = {
             "tweet_id": self.tweet_id,
             "username": self.username,
@@ -235,15 +368,77 @@ class Post:
             "view_count": self.view_count,
             "images": self.images,
             "videos": self.videos,
-            "user_details": self.user_details.__dict__,
-            "post_data": self.post_data.__dict__,
+            "user_details": self.user_details.to_dict(),
+            "post_data": self.post_data.to_dict(),
         }
 
         if self.quoted_tweet_id:
             result["quoted_tweet_id"] = self.quoted_tweet_id
 
         if self.quoted_tweet:
-            logger.debug("Including quoted tweet in dictionary")
+            if debug:
+                logger.debug("Including quoted tweet in dictionary")
             result["quoted_tweet"] = self.quoted_tweet.to_dict()
 
         return result
+
+    def write_json(
+        self, fp: IO[str], indent: Optional[int] = None, ensure_ascii: bool = True
+    ) -> None:
+        """
+        Write the Post as JSON to a file-like object.
+
+        Produces the same document as ``json.dump(post.to_dict(), fp)``, but emits it
+        field by field so quoted tweets are written in place instead of being collected
+        into one nested dictionary first.
+
+        Args:
+            fp: Text file-like object to write to
+            indent: Indentation level for pretty-printing (default: compact output)
+            ensure_ascii: Whether to escape non-ASCII characters (default: True)
+        """
+        logger.debug("Writing Post as JSON for tweet ID: %s", self.tweet_id)
+        self._write_json(fp, indent, ensure_ascii, 0)
+
+    def _write_json(
+        self, fp: IO[str], indent: Optional[int], ensure_ascii: bool, level: int
+    ) -> None:
+        """Write this Post as a JSON object nested ``level`` deep."""
+        if indent is None:
+            newline, item_separator, closing = "", ", ", ""
+        else:
+            newline = "\n" + " " * (indent * (level + 1))
+            item_separator = ","
+            closing = "\n" + " " * (indent * level)
+
+        fields = [
+            ("tweet_id", self.tweet_id),
+            ("username", self.username),
+            ("created_at", self.created_at),
+            ("text", self.text),
+            ("view_count", self.view_count),
+            ("images", self.images),
+            ("videos", self.videos),
+            ("user_details", self.user_details.to_dict()),
+            ("post_data", self.post_data.to_dict()),
+        ]
+        if self.quoted_tweet_id:
+            fields.append(("quoted_tweet_id", self.quoted_tweet_id))
+        if self.quoted_tweet:
+            fields.append(("quoted_tweet", self.quoted_tweet))
+
+        fp.write("{")
+        for i, (key, value) in enumerate(fields):
+            if i:
+                fp.write(item_separator)
+            fp.write(newline)
+            fp.write(json.encoder.encode_basestring_ascii(key))
+            fp.write(": ")
+            if isinstance(value, Post):
+                value._write_json(fp, indent, ensure_ascii, level + 1)
+            else:
+                encoded = json.dumps(value, indent=indent, ensure_ascii=ensure_ascii)
+                # Nested containers are indented relative to the current level
+                fp.write(encoded.replace("\n", newline) if indent is not None else encoded)
+        fp.write(closing)
+        fp.write("}")
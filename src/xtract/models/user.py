@@ -3,17 +3,23 @@ Models for user data from X posts.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any
 
 from xtract.config.logging import get_logger
+from xtract.models._compat import DATACLASS_SLOTS
 
 # Get a logger for this module
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class UserDetails:
-    """Class to represent user information from X."""
+    """
+    Class to represent user information from X.
+
+    Instances are immutable so they can be shared between posts by the same author.
+    """
 
     name: str = ""
     screen_name: str = ""
@@ -42,21 +48,61 @@ class UserDetails:
             UserDetails: Populated instance
         """
         logger.debug(f"Creating UserDetails for user: {data.get('screen_name', 'unknown')}")
-        user = cls(
-            name=data.get("name", ""),
-            screen_name=data.get("screen_name", ""),
-            description=data.get("description", ""),
-            followers_count=data.get("followers_count", 0),
-            friends_count=data.get("friends_count", 0),
-            location=data.get("location", ""),
-            created_at=data.get("created_at", ""),
-            profile_image_url=data.get("profile_image_url_https", ""),
-            profile_banner_url=data.get("profile_banner_url", ""),
-            statuses_count=data.get("statuses_count", 0),
-            media_count=data.get("media_count", 0),
-            listed_count=data.get("listed_count", 0),
-            is_verified=data.get("verified", False),
-            is_blue_verified=data.get("is_blue_verified", False),
+        # Positional values in field order, used both to build and to look up the instance
+        values = (
+            data.get("name", ""),
+            data.get("screen_name", ""),
+            data.get("description", ""),
+            data.get("followers_count", 0),
+            data.get("friends_count", 0),
+            data.get("location", ""),
+            data.get("created_at", ""),
+            data.get("profile_image_url_https", ""),
+            data.get("profile_banner_url", ""),
+            data.get("statuses_count", 0),
+            data.get("media_count", 0),
+            data.get("listed_count", 0),
+            data.get("verified", False),
+            data.get("is_blue_verified", False),
         )
+        if cls is UserDetails:
+            try:
+                # Authors repeat across a batch; identical data yields one shared instance
+                user = _shared_user(values)
+            except TypeError:
+                # Unhashable values in the payload; build an unshared instance instead
+                user = cls(*values)
+        else:
+            user = cls(*values)
         logger.debug(f"Successfully created UserDetails for {user.screen_name}")
         return user
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the UserDetails to a dictionary.
+
+        Returns:
+            Dict[str, Any]: Dictionary representation of the user
+        """
+        return {
+            "name": self.name,
+            "screen_name": self.screen_name,
+            "description": self.description,
+            "followers_count": self.followers_count,
+            "friends_count": self.friends_count,
+            "location": self.location,
+            "created_at": self.created_at,
+            "profile_image_url": self.profile_image_url,
+            "profile_banner_url": self.profile_banner_url,
+            "statuses_count": self.statuses_count,
+            "media_count": self.media_count,
+            "listed_count": self.listed_count,
+            "is_verified": self.is_verified,
+            "is_blue_verified": self.is_blue_verified,
+        }
+
+
+@lru_cache(maxsize=2048)
+def _shared_user(values: tuple) -> UserDetails:
+    """Return a cached UserDetails for the given field values."""
+    return UserDetails(*values)
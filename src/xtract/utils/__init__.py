@@ -2,14 +2,17 @@
 Utility functions for the xtract library.
 """
 
-from xtract.utils.file import save_json, ensure_directory
+from xtract.utils.file import save_json, load_json, save_post_json, ensure_directory
 from xtract.utils.media import extract_media_urls
-from xtract.utils.markdown import post_to_markdown, save_post_as_markdown
+from xtract.utils.markdown import post_to_markdown, save_post_as_markdown, save_posts_as_markdown
 
 __all__ = [
     "save_json",
+    "load_json",
+    "save_post_json",
     "ensure_directory",
     "extract_media_urls",
     "post_to_markdown",
     "save_post_as_markdown",
+    "save_posts_as_markdown",
 ]
@@ -3,39 +3,138 @@ File handling utilities for the xtract library.
 """
 
 import os
-import json
-from typing import Any
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Union
 
 from xtract.config.logging import get_logger
+from xtract.utils.serialization import HAS_ORJSON, dumps, loads
 
 # Get a logger for this module
 logger = get_logger(__name__)
 
+# File and directory paths may be given as strings or Path objects
+_PathLike = Union[str, "os.PathLike[str]"]
 
-def save_json(data: Any, filepath: str) -> None:
+# Temporary files from mkstemp are private (0600), so saved files are given the mode
+# open() would have used. os.umask can only be read by setting it, so read it once here.
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def _open_atomic(filepath: _PathLike, mode: str = "wb", **kwargs: Any) -> Iterator[IO]:
+    """
+    Open a temporary file next to filepath and move it over filepath on success.
+
+    Every call gets its own uniquely named temporary file in the target directory,
+    so concurrent saves to the same path never share one. If writing fails the
+    temporary file is removed and any existing file at filepath is left untouched.
+
+    Args:
+        filepath: Path of the file to write
+        mode: Mode to open the temporary file with (default: "wb")
+        **kwargs: Further arguments for open()
+
+    Yields:
+        The open temporary file
+    """
+    filepath = os.fspath(filepath)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(filepath) or ".",
+        prefix=os.path.basename(filepath) + ".",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            os.chmod(tmp_path, _FILE_MODE)
+            yield f
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_json(data: Any, filepath: _PathLike, pretty: bool = True) -> None:
     """
     Utility to save data as JSON with consistent formatting.
 
+    Output is indented with two spaces by default; pass pretty=False for compact
+    output, which is faster to write and smaller on disk.
+
+    The data is written to a temporary file next to filepath and then moved over
+    it, so an interrupted save never leaves a truncated file behind.
+
     Args:
         data: Data to save as JSON
         filepath: Path where to save the file
+        pretty: Whether to indent the output (default: True)
     """
     logger.debug(f"Saving JSON data to {filepath}")
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Serialize first so data that cannot be encoded never touches the disk
+    payload = dumps(data, indent=pretty)
+    with _open_atomic(filepath) as f:
+        f.write(payload)
     logger.debug(f"Successfully saved JSON data to {filepath}")
 
 
-def ensure_directory(directory: str) -> None:
+def load_json(filepath: _PathLike) -> Any:
+    """
+    Load JSON data from a file, the counterpart of save_json.
+
+    The file is read as bytes and parsed in one call, so orjson (when installed)
+    works on the UTF-8 payload directly without a text decoding step.
+
+    Args:
+        filepath: Path of the file to load
+
+    Returns:
+        The parsed JSON data
+    """
+    logger.debug(f"Loading JSON data from {filepath}")
+    with open(filepath, "rb") as f:
+        return loads(f.read())
+
+
+def save_post_json(post: Any, filepath: _PathLike) -> None:
+    """
+    Save a Post as JSON with the same formatting as save_json.
+
+    With orjson installed the Post is converted to a dictionary and encoded in one
+    call, which is much faster than the standard library. Otherwise it is streamed
+    to the file with Post.write_json rather than being converted first. Either way
+    the file is replaced atomically, as in save_json.
+
+    Args:
+        post: Post object to save
+        filepath: Path where to save the file
+    """
+    if HAS_ORJSON:
+        logger.debug(f"Saving post JSON to {filepath}")
+        payload = dumps(post.to_dict(), indent=True)
+        with _open_atomic(filepath) as f:
+            f.write(payload)
+    else:
+        logger.debug(f"Streaming post JSON to {filepath}")
+        with _open_atomic(filepath, "w", encoding="utf-8") as f:
+            post.write_json(f, indent=2, ensure_ascii=False)
+    logger.debug(f"Successfully saved post JSON to {filepath}")
+
+
+def ensure_directory(directory: _PathLike) -> None:
     """
     Ensure a directory exists, creating it if necessary.
 
+    This is a single os.makedirs(exist_ok=True) call, cheap enough to repeat for
+    every post. Nothing is cached, so a directory removed in the meantime (e.g.
+    by cleanup in a long-running process) is simply created again.
+
     Args:
         directory: Directory path to create
     """
-    if not os.path.exists(directory):
-        logger.debug(f"Creating directory: {directory}")
-        os.makedirs(directory, exist_ok=True)
-        logger.debug(f"Successfully created directory: {directory}")
-    else:
-        logger.debug(f"Directory already exists: {directory}")
+    logger.debug(f"Ensuring directory exists: {directory}")
+    os.makedirs(directory, exist_ok=True)
@@ -3,17 +3,65 @@ Markdown utilities for X post data.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, List
 
 from xtract.config.logging import get_logger
-from xtract.models.post import Post
+from xtract.utils.file import _open_atomic, ensure_directory
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing it at runtime would create a cycle
+    # (models.post -> utils -> utils.markdown -> models.post)
+    from xtract.models.post import Post
 
 # Get a logger for this module
 logger = get_logger(__name__)
 
 
+# Lookup tables indexed by a bool
+_BADGE = ("", "✓")
+_BOOL_YAML = ("false", "true")
+
+# Multi-line sections filled in with a single %-format each. Both end with the
+# blank line that separates them from the next section.
+_HEADER_TEMPLATE = "# Post by @%s %s\n**%s** (@%s) • %s\n"
+_STATS_TEMPLATE = (
+    "## Stats\n"
+    "* **Views:** %s\n"
+    "* **Likes:** %s\n"
+    "* **Retweets:** %s\n"
+    "* **Replies:** %s\n"
+    "* **Quotes:** %s\n"
+)
+
+
+def _parse_x_date(post: "Post") -> str:
+    """
+    Format a post's creation time as "YYYY-MM-DD HH:MM:SS".
+
+    Uses Post.created_at_datetime, so Markdown and the model share one parser
+    and its cache.
+
+    Args:
+        post: Post whose created_at should be formatted
+
+    Returns:
+        str: The formatted date, or created_at unchanged if it cannot be parsed
+    """
+    created_at = post.created_at_datetime
+    if created_at is None:
+        logger.warning("Failed to parse date '%s'", post.created_at)
+        return post.created_at
+    return created_at.strftime("%Y-%m-%d %H:%M:%S")
+
+
 def post_to_markdown(
-    post: Post, include_stats: bool = True, include_metadata: bool = True
+    post: "Post",
+    include_stats: bool = True,
+    include_metadata: bool = True,
+    line_prefix: str = "",
+    downloaded_at: str = None,
 ) -> tuple[dict, str]:
     """
     Convert a Post object to a tuple of metadata dict and markdown content.
@@ -22,31 +70,60 @@ def post_to_markdown(
         post: The Post object to convert
         include_stats: Whether to include post statistics (default: True)
         include_metadata: Whether to include YAML frontmatter metadata (default: True)
+        line_prefix: String prepended to every line of the output (default: "")
+        downloaded_at: Timestamp for the downloaded_at metadata field (default: now)
 
     Returns:
         tuple[dict, str]: Tuple containing metadata dict and markdown content
     """
-    logger.info(f"Converting post {post.tweet_id} to Markdown")
+    md = []
+    metadata = _render_markdown(
+        post, include_stats, include_metadata, line_prefix, md, downloaded_at=downloaded_at
+    )
+    return metadata, "\n".join(md)
+
+
+def _render_markdown(
+    post: "Post",
+    include_stats: bool,
+    include_metadata: bool,
+    line_prefix: str,
+    md: list,
+    downloaded_at: str = None,
+) -> dict:
+    """
+    Append the Markdown lines for a post to md, each starting with line_prefix.
+
+    Quoted tweets are rendered into the same list with a longer prefix, so the
+    whole chain is joined exactly once by the caller.
+
+    Returns:
+        dict: The metadata for the post (empty if include_metadata is False)
+    """
+    logger.info("Converting post %s to Markdown", post.tweet_id)
     logger.debug(
-        f"Markdown options: include_stats={include_stats}, include_metadata={include_metadata}"
+        "Markdown options: include_stats=%s, include_metadata=%s", include_stats, include_metadata
     )
 
+    if line_prefix:
+        # Values such as the post text can span several lines; each one needs the prefix
+        continuation = "\n" + line_prefix
+
+        def add(line: str) -> None:
+            md.append(line_prefix + line.replace("\n", continuation))
+
+    else:
+        add = md.append
+
     # Parse the date to a more readable format
-    try:
-        # X date format: "Wed Feb 28 12:00:00 +0000 2024"
-        created_date = datetime.strptime(post.created_at, "%a %b %d %H:%M:%S %z %Y")
-        formatted_date = created_date.strftime("%Y-%m-%d %H:%M:%S")
-        logger.debug(f"Parsed date: {formatted_date}")
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Failed to parse date '{post.created_at}': {e}")
-        formatted_date = post.created_at
+    formatted_date = _parse_x_date(post)
 
-    md = []
     metadata = {}
-
     # Add YAML frontmatter metadata section
     if include_metadata:
         logger.debug("Adding YAML frontmatter metadata")
+        if downloaded_at is None:
+            downloaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         metadata = {
             "tweet_id": post.tweet_id,
             "author": post.username,
@@ -62,85 +139,132 @@ def post_to_markdown(
             "quotes": post.post_data.quote_count,
             "has_quoted_tweet": bool(post.quoted_tweet),
             "url": f"https://x.com/{post.username}/status/{post.tweet_id}",
-            "downloaded_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "downloaded_at": downloaded_at,
             "downloaded_by": "xtract",
         }
 
         # Add quoted tweet ID if present (even if we don't have full data)
         if post.quoted_tweet_id:
-            logger.debug(f"Including quoted tweet ID in metadata: {post.quoted_tweet_id}")
+            logger.debug("Including quoted tweet ID in metadata: %s", post.quoted_tweet_id)
             metadata["quoted_tweet_id"] = post.quoted_tweet_id
 
         # Add additional quoted tweet metadata if we have full data
         if post.quoted_tweet:
             logger.debug(
-                f"Including full quoted tweet metadata for tweet ID: {post.quoted_tweet.tweet_id}"
+                "Including full quoted tweet metadata for tweet ID: %s", post.quoted_tweet.tweet_id
             )
             metadata["quoted_tweet_author"] = post.quoted_tweet.username
 
     # Start with the post header - user info and timestamp
-    verification_badge = "✓" if post.user_details.is_verified else ""
+    verification_badge = _BADGE[bool(post.user_details.is_verified)]
 
     logger.debug("Adding post header and content")
-    md.append(f"# Post by @{post.username} {verification_badge}")
-    md.append(f"**{post.user_details.name}** (@{post.username}) • {formatted_date}")
-    md.append("")
+    add(
+        _HEADER_TEMPLATE
+        % (post.username, verification_badge, post.user_details.name, post.username, formatted_date)
+    )
 
     # Post content
-    md.append(post.text)
-    md.append("")
+    add(post.text)
+    add("")
 
     # Images
     if post.images:
-        logger.debug(f"Adding {len(post.images)} images to Markdown")
-        md.append("## Images")
-        for i, image_url in enumerate(post.images, 1):
-            md.append(f"![Image {i}]({image_url})")
-        md.append("")
+        logger.debug("Adding %d images to Markdown", len(post.images))
+        image_lines = "\n".join(
+            [f"![Image {i}]({image_url})" for i, image_url in enumerate(post.images, 1)]
+        )
+        add(f"## Images\n{image_lines}\n")
 
     # Videos
     if post.videos:
-        logger.debug(f"Adding {len(post.videos)} videos to Markdown")
-        md.append("## Videos")
-        for i, video_url in enumerate(post.videos, 1):
-            md.append(f"[Video {i}]({video_url})")
-        md.append("")
+        logger.debug("Adding %d videos to Markdown", len(post.videos))
+        video_lines = "\n".join(
+            [f"[Video {i}]({video_url})" for i, video_url in enumerate(post.videos, 1)]
+        )
+        add(f"## Videos\n{video_lines}\n")
 
     # Quoted tweet if present
     if post.quoted_tweet:
-        logger.debug(f"Processing quoted tweet {post.quoted_tweet.tweet_id}")
-        md.append("## Quoted Tweet")
-        md.append("---")
+        logger.debug("Processing quoted tweet %s", post.quoted_tweet.tweet_id)
+        add("## Quoted Tweet\n---")
         # Recursively format the quoted tweet but without stats to keep it cleaner
-        # Also skip metadata for quoted tweets
-        quoted_md = post_to_markdown(
-            post.quoted_tweet, include_stats=False, include_metadata=False
-        )[1]
-        # Indent the quoted tweet content to make it visually distinct
-        quoted_md_indented = "\n".join([f"> {line}" for line in quoted_md.split("\n")])
-        md.append(quoted_md_indented)
-        md.append("---")
-        md.append("")
+        # Also skip metadata for quoted tweets. The extra "> " prefix indents the
+        # quoted content to make it visually distinct.
+        _render_markdown(post.quoted_tweet, False, False, line_prefix + "> ", md)
+        add("---\n")
 
     # Post stats if requested
     if include_stats:
         logger.debug("Adding post statistics")
-        md.append("## Stats")
-        md.append(f"* **Views:** {post.view_count}")
-        md.append(f"* **Likes:** {post.post_data.favorite_count}")
-        md.append(f"* **Retweets:** {post.post_data.retweet_count}")
-        md.append(f"* **Replies:** {post.post_data.reply_count}")
-        md.append(f"* **Quotes:** {post.post_data.quote_count}")
-        md.append("")
+        post_data = post.post_data
+        add(
+            _STATS_TEMPLATE
+            % (
+                post.view_count,
+                post_data.favorite_count,
+                post_data.retweet_count,
+                post_data.reply_count,
+                post_data.quote_count,
+            )
+        )
 
     # Add a metadata footer with the tweet ID for reference
-    md.append(f"*Tweet ID: {post.tweet_id}*")
+    add(f"*Tweet ID: {post.tweet_id}*")
 
     logger.debug("Markdown generation complete")
-    return metadata, "\n".join(md)
+    return metadata
+
+
+def _format_frontmatter(metadata: dict) -> str:
+    """
+    Serialize a metadata dict as a YAML frontmatter block.
 
+    Args:
+        metadata: Flat mapping of frontmatter keys to scalar values. Booleans are
+                  written as YAML true/false.
 
-def save_post_as_markdown(post: Post, output_dir: str = None, filename: str = None) -> str:
+    Returns:
+        str: The frontmatter, ending with the closing "---" line (no trailing newline)
+    """
+    body = "\n".join(
+        [
+            f"{key}: {_BOOL_YAML[value] if value is True or value is False else value}"
+            for key, value in metadata.items()
+        ]
+    )
+    return f"---\n{body}\n---"
+
+
+def _markdown_file_content(post: "Post", downloaded_at: str = None) -> bytes:
+    """
+    Render the full contents of a post's Markdown file, frontmatter included.
+
+    The frontmatter and body share one line list, so the file is assembled with a
+    single join and a single encode.
+
+    Args:
+        post: The Post object to render
+        downloaded_at: Timestamp for the downloaded_at metadata field (default: now)
+
+    Returns:
+        bytes: The UTF-8 encoded file contents
+    """
+    logger.debug("Generating Markdown content and metadata")
+    # The first slot is reserved for the frontmatter, which depends on the metadata
+    md = [""]
+    metadata = _render_markdown(post, True, True, "", md, downloaded_at=downloaded_at)
+
+    # Add YAML frontmatter if metadata exists
+    if metadata:
+        md[0] = _format_frontmatter(metadata)
+    else:
+        del md[0]
+
+    return "\n".join(md).encode("utf-8")
+
+
+def save_post_as_markdown(post: "Post", output_dir: str = None, filename: str = None) -> str:
     """
     Save a Post as a Markdown file.
 
@@ -152,52 +276,92 @@ def save_post_as_markdown(post: Post, output_dir: str = None, filename: str = No
     Returns:
         str: Path to the saved Markdown file
     """
-    logger.info(f"Saving post {post.tweet_id} as Markdown")
+    logger.info("Saving post %s as Markdown", post.tweet_id)
 
     # Generate Markdown content and metadata
-    logger.debug("Generating Markdown content and metadata")
-    metadata, markdown_content = post_to_markdown(post)
-
-    # Add YAML frontmatter if metadata exists
-    if metadata:
-        yaml_frontmatter = ["---"]
-        for key, value in metadata.items():
-            yaml_frontmatter.append(f"{key}: {value}")
-        yaml_frontmatter.append("---\n")
-        markdown_content = "\n".join(yaml_frontmatter) + markdown_content
+    markdown_bytes = _markdown_file_content(post)
 
     # Determine the output directory
     if output_dir is None:
+        # The current directory always exists, so there is nothing to create
         output_dir = os.getcwd()
-        logger.debug(f"No output directory specified, using current directory: {output_dir}")
+        logger.debug("No output directory specified, using current directory: %s", output_dir)
     else:
-        logger.debug(f"Using specified output directory: {output_dir}")
+        logger.debug("Using specified output directory: %s", output_dir)
 
-    # Ensure the directory exists
-    logger.debug(f"Ensuring directory exists: {output_dir}")
-    os.makedirs(output_dir, exist_ok=True)
+        # Ensure the directory exists
+        logger.debug("Ensuring directory exists: %s", output_dir)
+        ensure_directory(output_dir)
 
     # Determine the filename
     if filename is None:
         filename = f"tweet_{post.tweet_id}.md"
-        logger.debug(f"No filename specified, using default: {filename}")
+        logger.debug("No filename specified, using default: %s", filename)
     else:
-        logger.debug(f"Using specified filename: {filename}")
+        logger.debug("Using specified filename: %s", filename)
 
     # Make sure the filename has the .md extension
     if not filename.endswith(".md"):
         filename += ".md"
-        logger.debug(f"Added .md extension to filename: {filename}")
+        logger.debug("Added .md extension to filename: %s", filename)
 
     # Create the full file path
     file_path = os.path.join(output_dir, filename)
-    logger.debug(f"Full file path: {file_path}")
+    logger.debug("Full file path: %s", file_path)
 
     # Write the Markdown content to the file
-    logger.debug(f"Writing Markdown content to file: {file_path}")
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(markdown_content)
+    logger.debug("Writing Markdown content to file: %s", file_path)
+    _write_bytes(file_path, markdown_bytes)
 
-    logger.info(f"Markdown file saved to: {file_path}")
-    print(f"Markdown file saved to: {file_path}")
+    logger.info("Markdown file saved to: %s", file_path)
     return file_path
+
+
+def _write_bytes(file_path: str, data: bytes) -> None:
+    """Write pre-encoded bytes to a file, replacing it atomically like save_json."""
+    with _open_atomic(file_path) as f:
+        f.write(data)
+
+
+def save_posts_as_markdown(
+    posts: Iterable["Post"], output_dir: str = None, max_workers: int = 4
+) -> List[str]:
+    """
+    Save several Posts as Markdown files in one directory.
+
+    All files are rendered before any is written, and the output directory is
+    created once rather than per post. The writes themselves are spread over a
+    small thread pool. Each file is named tweet_<tweet_id>.md.
+
+    Args:
+        posts: The Post objects to save
+        output_dir: Directory to save the Markdown files (default: cwd)
+        max_workers: Maximum number of files to write at the same time (default: 4)
+
+    Returns:
+        List[str]: Paths to the saved Markdown files, in the same order as posts
+    """
+    # Render everything first so the write stage only does I/O. The whole batch
+    # shares one downloaded_at timestamp.
+    downloaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rendered = [(post.tweet_id, _markdown_file_content(post, downloaded_at)) for post in posts]
+    logger.info("Saving %d posts as Markdown", len(rendered))
+
+    if output_dir is None:
+        output_dir = os.getcwd()
+    else:
+        ensure_directory(output_dir)
+
+    file_paths = [os.path.join(output_dir, f"tweet_{tweet_id}.md") for tweet_id, _ in rendered]
+    payloads = [markdown_bytes for _, markdown_bytes in rendered]
+
+    if max_workers > 1 and len(rendered) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results so any write error is raised here
+            list(executor.map(_write_bytes, file_paths, payloads))
+    else:
+        for file_path, markdown_bytes in zip(file_paths, payloads):
+            _write_bytes(file_path, markdown_bytes)
+
+    logger.info("Saved %d Markdown files to: %s", len(file_paths), output_dir)
+    return file_paths
@@ -2,7 +2,8 @@
 Utilities for handling media data from X posts.
 """
 
-from typing import List, Dict, Any, Tuple
+import logging
+from typing import List, Dict, Any, Optional, Tuple
 
 from xtract.config.logging import get_logger
 
@@ -10,6 +11,54 @@ from xtract.config.logging import get_logger
 logger = get_logger(__name__)
 
 
+def _best_variant_url(variants: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Return the URL of the highest-bitrate variant.
+
+    Ties keep the first variant seen, and a missing or null bitrate counts as 0.
+
+    Args:
+        variants: Variant objects from a media item's video_info
+
+    Returns:
+        Optional[str]: URL of the best variant, or None if there are no variants
+    """
+    best_url, best_bitrate = None, -1
+    for variant in variants:
+        bitrate = variant.get("bitrate") or 0
+        if bitrate > best_bitrate:
+            best_bitrate, best_url = bitrate, variant.get("url")
+    return best_url
+
+
+def _add_photo(item: Dict[str, Any], images: List[str], videos: List[str], debug: bool) -> None:
+    """Append the URL of a photo media item to images."""
+    if url := item.get("media_url_https"):
+        if debug:
+            logger.debug("Found image URL: %s", url)
+        images.append(url)
+
+
+def _add_video(item: Dict[str, Any], images: List[str], videos: List[str], debug: bool) -> None:
+    """Append the highest-bitrate URL of a video or GIF media item to videos."""
+    variants = item.get("video_info", {}).get("variants", ())
+    if debug:
+        logger.debug("Found %d video variants for %s", len(variants), item.get("type"))
+    best_url = _best_variant_url(variants)
+    if best_url:
+        if debug:
+            logger.debug("Selected best video URL: %s", best_url)
+        videos.append(best_url)
+
+
+# Handler for each supported media type; other types are ignored
+_MEDIA_HANDLERS = {
+    "photo": _add_photo,
+    "video": _add_video,
+    "animated_gif": _add_video,
+}
+
+
 def extract_media_urls(media: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
     """
     Extract images and videos from tweet media data.
@@ -20,20 +69,20 @@ def extract_media_urls(media: List[Dict[str, Any]]) -> Tuple[List[str], List[str
     Returns:
         Tuple[List[str], List[str]]: Tuple containing (images URLs, video URLs)
     """
-    logger.debug(f"Extracting media URLs from {len(media) if media else 0} media items")
+    # Most posts carry no media at all
+    if not media:
+        return [], []
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Extracting media URLs from %d media items", len(media))
     images, videos = [], []
-    for item in media or []:
-        if item.get("type") == "photo":
-            if url := item.get("media_url_https"):
-                logger.debug(f"Found image URL: {url}")
-                images.append(url)
-        elif item.get("type") in ["video", "animated_gif"]:
-            variants = item.get("video_info", {}).get("variants", [])
-            logger.debug(f"Found {len(variants)} video variants for {item.get('type')}")
-            if best_variant := max(variants, key=lambda x: x.get("bitrate", 0), default={}):
-                if url := best_variant.get("url"):
-                    logger.debug(f"Selected best video URL: {url}")
-                    videos.append(url)
-
-    logger.debug(f"Extracted {len(images)} images and {len(videos)} videos")
+    get_handler = _MEDIA_HANDLERS.get
+    for item in media:
+        handler = get_handler(item.get("type"))
+        if handler is not None:
+            handler(item, images, videos, debug)
+
+    if debug:
+        logger.debug("Extracted %d images and %d videos", len(images), len(videos))
     return images, videos
@@ -0,0 +1,65 @@
+"""
+JSON serialization helpers for the xtract library.
+
+orjson is used when it is installed (pip install xtract[speedups]); otherwise these
+helpers fall back to the standard library json module.
+"""
+
+import json
+from typing import Any, Union
+
+from xtract.config.logging import get_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+# Whether the orjson backend is in use
+HAS_ORJSON = orjson is not None
+
+# Get a logger for this module
+logger = get_logger(__name__)
+logger.debug(f"JSON backend: {'orjson' if orjson is not None else 'json'}")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON document as UTF-8 bytes or a string. Passing the raw bytes of an
+              HTTP response avoids decoding it to a string first.
+
+    Returns:
+        Any: The parsed data
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to a JSON document.
+
+    Non-ASCII characters are written as UTF-8 rather than escaped.
+
+    Args:
+        data: Data to serialize
+        indent: Whether to pretty-print with a two-space indent (default: False)
+
+    Returns:
+        bytes: UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
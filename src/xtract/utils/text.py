@@ -36,29 +36,32 @@ def expand_urls(text: str, url_entities: List[Dict[str, Any]]) -> str:
         return text
 
     try:
-        expanded_text = text
-
-        # Process each URL entity
+        # Map each t.co URL to its expansion; the first entity for a URL wins
+        replacements = {}
         for entity in url_entities:
             t_co_url = entity.get("url", "")
             expanded_url = entity.get("expanded_url", "")
 
             if not t_co_url or not expanded_url:
-                logger.debug(f"Skipping entity with missing URL data: {entity}")
+                logger.debug("Skipping entity with missing URL data: %s", entity)
                 continue
 
-            # Escape special regex characters in the t.co URL
-            t_co_pattern = re.escape(t_co_url)
+            replacements.setdefault(t_co_url, expanded_url)
+            logger.debug("Expanded URL: %s -> %s", t_co_url, expanded_url)
 
-            # Replace the t.co URL with expanded URL
-            # The pattern ensures we match the URL but not trailing punctuation
-            expanded_text = re.sub(t_co_pattern, expanded_url, expanded_text)
+        if not replacements:
+            return text
 
-            logger.debug(f"Expanded URL: {t_co_url} -> {expanded_url}")
+        # One alternation pattern replaces every URL in a single scan. Longer URLs
+        # come first so a URL that is a prefix of another cannot shadow it.
+        pattern = re.compile(
+            "|".join(re.escape(url) for url in sorted(replacements, key=len, reverse=True))
+        )
+        expanded_text = pattern.sub(lambda match: replacements[match.group(0)], text)
 
-        logger.info(f"Expanded {len(url_entities)} URL(s) in tweet text")
+        logger.info("Expanded %d URL(s) in tweet text", len(url_entities))
         return expanded_text
 
     except Exception as e:
-        logger.warning(f"Failed to expand URLs: {e}. Returning original text.")
+        logger.warning("Failed to expand URLs: %s. Returning original text.", e)
         return text
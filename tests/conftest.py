@@ -10,11 +10,20 @@ from unittest.mock import MagicMock
 # Fix import path for GitHub Actions
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from xtract.api.client import _guest_tokens
 from xtract.models.post import Post, PostData
 from xtract.models.user import UserDetails
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _clear_guest_token_memo():
+    """Start every test without guest tokens remembered by earlier tests."""
+    _guest_tokens.clear()
+    yield
+    _guest_tokens.clear()
+
+
+@pytest.fixture(scope="session")
 def sample_user_data():
     """Sample user data for testing."""
     return {
@@ -35,7 +44,7 @@ def sample_user_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_tweet_data():
     """Sample tweet data for testing."""
     return {
@@ -90,28 +99,43 @@ def sample_tweet_data():
     }
 
 
-@pytest.fixture
-def sample_user_details():
-    """Sample UserDetails instance for testing."""
-    return UserDetails(
-        name="Test User",
-        screen_name="testuser",
-        description="This is a test user",
-        followers_count=1000,
-        friends_count=500,
-        location="Test Location",
-        created_at="Wed Feb 28 12:00:00 +0000 2024",
-        profile_image_url="https://example.com/profile.jpg",
-        profile_banner_url="https://example.com/banner.jpg",
-        statuses_count=1500,
-        media_count=100,
-        listed_count=50,
-        is_verified=True,
-        is_blue_verified=True,
-    )
+@pytest.fixture(scope="session")
+def mock_tweet_api_response():
+    """Minimal TweetResultByRestId response, shared read-only across tests."""
+    return {
+        "data": {
+            "tweetResult": {
+                "result": {
+                    "rest_id": "123456789",
+                    "legacy": {
+                        "created_at": "Wed Feb 28 12:00:00 +0000 2024",
+                        "full_text": "This is a test tweet",
+                    },
+                    "core": {
+                        "user_results": {
+                            "result": {
+                                "legacy": {
+                                    "screen_name": "testuser",
+                                    "name": "Test User",
+                                }
+                            }
+                        }
+                    },
+                    "views": {"count": "500"},
+                    "note_tweet": {"note_tweet_results": {"result": {}}},
+                }
+            }
+        }
+    }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_user_details(sample_user_data):
+    """Sample UserDetails instance for testing, built from sample_user_data."""
+    return UserDetails.from_dict(sample_user_data)
+
+
+@pytest.fixture(scope="session")
 def sample_post_data():
     """Sample PostData instance for testing."""
     return PostData(
@@ -132,7 +156,12 @@ def sample_post_data():
 
 @pytest.fixture
 def sample_post(sample_user_details, sample_post_data):
-    """Sample Post instance for testing."""
+    """
+    Sample Post instance for testing.
+
+    Tests modify the returned Post, so it stays function-scoped; it only wraps
+    the session-scoped user details and post data, which are never mutated.
+    """
     return Post(
         tweet_id="123456789",
         username="testuser",
@@ -150,6 +179,5 @@ def sample_post(sample_user_details, sample_post_data):
 def mock_response():
     """Create a mock response for requests."""
     mock = MagicMock()
-    mock.raise_for_status = MagicMock()
-    mock.json = MagicMock(return_value={"guest_token": "mock_token"})
+    mock.content = b'{"guest_token": "mock_token"}'
     return mock
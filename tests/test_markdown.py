@@ -2,11 +2,20 @@
 Tests for Markdown utilities.
 """
 
+import copy
 import os
-import tempfile
-from unittest.mock import patch, MagicMock
+import pytest
+from datetime import datetime
+from unittest.mock import patch
 
-from xtract.utils.markdown import post_to_markdown, save_post_as_markdown
+from xtract.models.post import Post, PostData
+from xtract.models.user import UserDetails
+from xtract.utils.markdown import (
+    _parse_x_date,
+    post_to_markdown,
+    save_post_as_markdown,
+    save_posts_as_markdown,
+)
 
 
 def test_post_to_markdown(sample_post):
@@ -41,67 +50,182 @@ def test_post_to_markdown(sample_post):
 def test_post_to_markdown_with_quoted_tweet(sample_post):
     """Test converting a post with a quoted tweet to Markdown."""
     # Create a quoted tweet
-    quoted_post = MagicMock()
-    quoted_post.tweet_id = "987654321"
-    quoted_post.username = "quoteduser"
-    quoted_post.text = "This is a quoted tweet"
-    quoted_post.created_at = "Wed Feb 28 10:00:00 +0000 2024"
-    quoted_post.user_details.name = "Quoted User"
-    quoted_post.user_details.is_verified = False
-    quoted_post.images = []
-    quoted_post.videos = []
-    quoted_post.view_count = "100"
-    quoted_post.post_data.favorite_count = 10
-    quoted_post.post_data.retweet_count = 5
-    quoted_post.post_data.reply_count = 2
-    quoted_post.post_data.quote_count = 1
-    quoted_post.quoted_tweet = None
+    quoted_post = Post(
+        tweet_id="987654321",
+        username="quoteduser",
+        created_at="Wed Feb 28 10:00:00 +0000 2024",
+        text="This is a quoted tweet",
+        view_count="100",
+        images=[],
+        videos=[],
+        user_details=UserDetails(name="Quoted User", screen_name="quoteduser"),
+        post_data=PostData(favorite_count=10, retweet_count=5, reply_count=2, quote_count=1),
+    )
 
     # Set the quoted tweet
     sample_post.quoted_tweet = quoted_post
     sample_post.quoted_tweet_id = quoted_post.tweet_id  # Set the quoted_tweet_id field
 
-    # Patch post_to_markdown for the quoted tweet to avoid recursion issues with the mock
-    with patch(
-        "xtract.utils.markdown.post_to_markdown",
-        side_effect=[
-            ({}, "Quoted tweet markdown"),  # First call for quoted tweet
-            ({}, "Main post with quoted tweet"),  # Second call for main post
-        ],
-    ):
-        # Call the function
-        metadata, markdown = post_to_markdown(sample_post)
+    # Call the function
+    metadata, markdown = post_to_markdown(sample_post)
+
+    # Check metadata
+    assert metadata["has_quoted_tweet"] is True
+    assert metadata["quoted_tweet_id"] == quoted_post.tweet_id
+    assert metadata["quoted_tweet_author"] == quoted_post.username
+
+    # Check that it references the quoted tweet
+    assert "## Quoted Tweet" in markdown
+
+    # Check that every line of the quoted tweet is indented
+    assert "> # Post by @quoteduser " in markdown
+    assert "> This is a quoted tweet" in markdown
+    assert "> *Tweet ID: 987654321*" in markdown
+    assert "> ## Stats" not in markdown
+
+
+def test_post_to_markdown_line_prefix(sample_post):
+    """Test that line_prefix is applied to every line, including multi-line text."""
+    sample_post.text = "First line\nSecond line"
+
+    _, plain = post_to_markdown(sample_post, include_metadata=False)
+    _, prefixed = post_to_markdown(sample_post, include_metadata=False, line_prefix="> ")
+
+    assert prefixed == "\n".join(f"> {line}" for line in plain.split("\n"))
+
 
-        # Check metadata
-        assert metadata["has_quoted_tweet"] is True
-        assert metadata["quoted_tweet_id"] == quoted_post.tweet_id
-        assert metadata["quoted_tweet_author"] == quoted_post.username
+def test_post_to_markdown_downloaded_at(sample_post):
+    """Test that a supplied downloaded_at timestamp is used as-is."""
+    metadata, _ = post_to_markdown(sample_post, downloaded_at="2024-01-01 00:00:00")
 
-        # Check that it references the quoted tweet
-        assert "## Quoted Tweet" in markdown
+    assert metadata["downloaded_at"] == "2024-01-01 00:00:00"
 
 
-def test_save_post_as_markdown(sample_post):
+def test_parse_x_date(sample_post):
+    """Test that a post's creation time is formatted from created_at_datetime."""
+    assert _parse_x_date(sample_post) == "2024-02-28 12:00:00"
+
+    # Times are shown in the post's own UTC offset, as X reports them
+    sample_post.created_at = "Sat Dec 31 23:59:59 +0530 2022"
+    assert _parse_x_date(sample_post) == "2022-12-31 23:59:59"
+
+    # Unparseable dates are returned unchanged
+    sample_post.created_at = "not a date"
+    assert _parse_x_date(sample_post) == "not a date"
+
+
+def test_save_post_as_markdown(sample_post, tmp_path):
     """Test saving a post as a Markdown file."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Patch post_to_markdown to return a known value
-        with patch(
-            "xtract.utils.markdown.post_to_markdown",
-            return_value=({"tweet_id": "123", "author": "test"}, "# Test Markdown"),
-        ):
-            # Call the function
-            file_path = save_post_as_markdown(sample_post, output_dir=temp_dir)
-
-            # Verify the file exists
-            assert os.path.exists(file_path)
-
-            # Verify the file has the correct name
-            assert file_path.endswith(f"tweet_{sample_post.tweet_id}.md")
-
-            # Verify the file contains the expected content
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                assert "---" in content  # Check for YAML frontmatter
-                assert "tweet_id: 123" in content
-                assert "author: test" in content
-                assert "# Test Markdown" in content
+    temp_dir = str(tmp_path)
+
+    # Patch the renderer to produce a known value
+    def fake_render(post, include_stats, include_metadata, line_prefix, md, **kwargs):
+        md.append("# Test Markdown")
+        return {"tweet_id": "123", "author": "test"}
+
+    with patch("xtract.utils.markdown._render_markdown", side_effect=fake_render):
+        # Call the function
+        file_path = save_post_as_markdown(sample_post, output_dir=temp_dir)
+
+        # Verify the file exists
+        assert os.path.exists(file_path)
+
+        # Verify the file has the correct name
+        assert file_path.endswith(f"tweet_{sample_post.tweet_id}.md")
+
+        # Verify the file holds the YAML frontmatter followed by the body, exactly
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        assert content == "---\ntweet_id: 123\nauthor: test\n---\n# Test Markdown"
+
+
+def test_save_post_as_markdown_yaml_booleans(sample_post, tmp_path):
+    """Test that boolean frontmatter values are written as YAML true/false."""
+    sample_post.user_details = UserDetails(name="Test User", is_verified=True)
+
+    temp_dir = str(tmp_path)
+    file_path = save_post_as_markdown(sample_post, output_dir=temp_dir)
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    assert "\nis_verified: true\n" in content
+    assert "\nhas_quoted_tweet: false\n" in content
+    assert f"# Post by @{sample_post.username} ✓" in content
+
+
+def test_save_post_as_markdown_writes_utf8(sample_post, capsys, tmp_path):
+    """Test that non-ASCII content is written as UTF-8 without printing to stdout."""
+    sample_post.text = "Café ☕ 日本語"
+
+    temp_dir = str(tmp_path)
+    file_path = save_post_as_markdown(sample_post, output_dir=temp_dir)
+
+    with open(file_path, "rb") as f:
+        content = f.read().decode("utf-8")
+
+    assert "Café ☕ 日本語" in content
+    assert capsys.readouterr().out == ""
+
+
+def test_save_posts_as_markdown(sample_post, tmp_path):
+    """Test saving several posts as Markdown files in one call."""
+    other_post = copy.copy(sample_post)
+    other_post.tweet_id = "555"
+
+    temp_dir = str(tmp_path)
+    output_dir = os.path.join(temp_dir, "batch")
+    file_paths = save_posts_as_markdown([sample_post, other_post], output_dir=output_dir)
+
+    assert file_paths == [
+        os.path.join(output_dir, f"tweet_{sample_post.tweet_id}.md"),
+        os.path.join(output_dir, "tweet_555.md"),
+    ]
+
+    # Each file matches what save_post_as_markdown would write, bar the timestamp
+    single_path = save_post_as_markdown(sample_post, output_dir=temp_dir)
+    with open(single_path, "rb") as f:
+        single = [line for line in f.read().split(b"\n") if b"downloaded_at" not in line]
+    with open(file_paths[0], "rb") as f:
+        batch = [line for line in f.read().split(b"\n") if b"downloaded_at" not in line]
+    assert batch == single
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_save_posts_as_markdown_failed_write_keeps_existing_files(
+    sample_post, tmp_path, max_workers
+):
+    """Test that an interrupted batch leaves earlier files intact and no temporary files."""
+    other_post = copy.copy(sample_post)
+    other_post.tweet_id = "555"
+    existing = [tmp_path / f"tweet_{sample_post.tweet_id}.md", tmp_path / "tweet_555.md"]
+    for path in existing:
+        path.write_bytes(b"previous contents")
+
+    with patch("xtract.utils.file.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            save_posts_as_markdown(
+                [sample_post, other_post], output_dir=str(tmp_path), max_workers=max_workers
+            )
+
+    assert [path.read_bytes() for path in existing] == [b"previous contents"] * 2
+    assert sorted(os.listdir(tmp_path)) == sorted(path.name for path in existing)
+
+
+def test_save_posts_as_markdown_serial_matches_threaded(sample_post, tmp_path):
+    """Test that the threaded write stage produces the same files as a serial one."""
+    posts = []
+    for tweet_id in ("1", "2", "3"):
+        post = copy.copy(sample_post)
+        post.tweet_id = tweet_id
+        posts.append(post)
+
+    temp_dir = str(tmp_path)
+    with patch("xtract.utils.markdown.datetime") as mock_datetime:
+        mock_datetime.now.return_value.strftime.return_value = "2024-01-01 00:00:00"
+        threaded = save_posts_as_markdown(posts, os.path.join(temp_dir, "a"), max_workers=3)
+        serial = save_posts_as_markdown(posts, os.path.join(temp_dir, "b"), max_workers=1)
+
+    for threaded_path, serial_path in zip(threaded, serial):
+        with open(threaded_path, "rb") as f1, open(serial_path, "rb") as f2:
+            assert f1.read() == f2.read()
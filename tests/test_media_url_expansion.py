@@ -1,27 +1,33 @@
 """Test that media URLs (t.co links in text) are properly expanded."""
 
-from xtract.models.post import Post
-
+import pytest
 
-def test_media_url_expansion_without_note_tweet():
-    """Test that t.co media URLs are expanded when there's no note_tweet."""
-    # Simulate a regular tweet with media URL in text but no note_tweet
-    # This is what happens when a tweet has media and the full_text
-    # ends with a t.co link to the media
-    tweet = {
-        "rest_id": "1234567890",
-        "views": {"count": "1000"},
-        "source": "Twitter for iPhone",
-    }
+from xtract.models.post import Post
 
-    legacy = {
+_TWEET = {
+    "rest_id": "1234567890",
+    "views": {"count": "1000"},
+    "source": "Twitter for iPhone",
+}
+
+_USER = {
+    "screen_name": "testuser",
+    "name": "Test User",
+    "description": "Test account",
+    "followers_count": 1000,
+    "friends_count": 500,
+    "location": "Test Location",
+    "created_at": "Mon Jan 01 12:00:00 +0000 2020",
+    "profile_image_url_https": "https://pbs.twimg.com/profile_images/test.jpg",
+}
+
+
+def _legacy(full_text):
+    """Legacy tweet data whose text ends with the t.co link to an attached video."""
+    return {
         "created_at": "Mon Jan 01 12:00:00 +0000 2024",
-        "full_text": "Check out this amazing video! https://t.co/abc123xyz",
-        "entities": {
-            "urls": [],  # Regular URL entities (empty in this case)
-            "hashtags": [],
-            "user_mentions": [],
-        },
+        "full_text": full_text,
+        "entities": {"urls": [], "hashtags": [], "user_mentions": []},
         "extended_entities": {
             "media": [
                 {
@@ -36,82 +42,59 @@ def test_media_url_expansion_without_note_tweet():
         "retweet_count": 50,
     }
 
-    user = {
-        "screen_name": "testuser",
-        "name": "Test User",
-        "description": "Test account",
-        "followers_count": 1000,
-        "friends_count": 500,
-        "location": "Test Location",
-        "created_at": "Mon Jan 01 12:00:00 +0000 2020",
-        "profile_image_url_https": "https://pbs.twimg.com/profile_images/test.jpg",
-    }
-
-    note_tweet = {}  # No note_tweet
-
-    # Create Post object
-    post = Post.from_api_data(tweet, legacy, user, note_tweet)
-
-    # The t.co link should be expanded
-    assert (
-        "t.co/abc123xyz" not in post.text
-    ), f"Media t.co URL should be expanded. Text: {post.text}"
-
-    # Check that it was replaced with the direct media URL (media_url_https)
-    assert (
-        "pbs.twimg.com/ext_tw_video_thumb/123/pu/img/video.jpg" in post.text
-    ), f"Media URL should be expanded to direct media URL. Text: {post.text}"
-
-
-def test_note_tweet_already_clean():
-    """Test that note_tweets already have clean text without media t.co links."""
-    # For note tweets, the note_tweet.text is already complete and doesn't
-    # have the truncated t.co link
-    tweet = {
-        "rest_id": "1234567890",
-        "views": {"count": "1000"},
-        "source": "Twitter for iPhone",
-    }
 
+@pytest.mark.parametrize(
+    "full_text, note_tweet, expected, forbidden",
+    [
+        # A regular tweet: the media t.co link is replaced with the direct media URL
+        pytest.param(
+            "Check out this amazing video! https://t.co/abc123xyz",
+            {},
+            "pbs.twimg.com/ext_tw_video_thumb/123/pu/img/video.jpg",
+            "t.co/abc123xyz",
+            id="without_note_tweet",
+        ),
+        # A note tweet: its complete text has no truncated t.co link to begin with
+        pytest.param(
+            "This is a long tweet that gets truncated... https://t.co/abc123xyz",
+            {
+                "text": "This is a long tweet that gets truncated but here's the full text without the media URL at the end because it's a note tweet and the media is handled separately.",
+                "entity_set": {"urls": []},
+            },
+            "This is a long tweet that gets truncated but here's the full text",
+            "t.co",
+            id="note_tweet_already_clean",
+        ),
+    ],
+)
+def test_media_url_expansion(full_text, note_tweet, expected, forbidden):
+    """Test that post text never keeps the media t.co link."""
+    post = Post.from_api_data(_TWEET, _legacy(full_text), _USER, note_tweet)
+
+    assert forbidden not in post.text, f"Media t.co URL should be expanded. Text: {post.text}"
+    assert expected in post.text, f"Unexpected post text: {post.text}"
+
+
+def test_media_url_expansion_leaves_api_data_unchanged():
+    """Test that media URLs are not appended to the caller's URL entities."""
+    url_entities = []
     legacy = {
         "created_at": "Mon Jan 01 12:00:00 +0000 2024",
-        # The legacy full_text is truncated and has t.co link
-        "full_text": "This is a long tweet that gets truncated... https://t.co/abc123xyz",
-        "entities": {"urls": [], "hashtags": [], "user_mentions": []},
+        "full_text": "Photo https://t.co/pic",
+        "entities": {"urls": url_entities},
         "extended_entities": {
             "media": [
                 {
-                    "type": "video",
-                    "url": "https://t.co/abc123xyz",
-                    "expanded_url": "https://x.com/user/status/1234567890/video/1",
-                    "media_url_https": "https://pbs.twimg.com/ext_tw_video_thumb/123/pu/img/video.jpg",
+                    "type": "photo",
+                    "url": "https://t.co/pic",
+                    "media_url_https": "https://pbs.twimg.com/media/pic.jpg",
                 }
             ]
         },
-        "favorite_count": 100,
-        "retweet_count": 50,
-    }
-
-    user = {
-        "screen_name": "testuser",
-        "name": "Test User",
-        "description": "Test account",
-        "followers_count": 1000,
-        "friends_count": 500,
-        "location": "Test Location",
-        "created_at": "Mon Jan 01 12:00:00 +0000 2020",
-        "profile_image_url_https": "https://pbs.twimg.com/profile_images/test.jpg",
-    }
-
-    # note_tweet has the full complete text without truncation
-    note_tweet = {
-        "text": "This is a long tweet that gets truncated but here's the full text without the media URL at the end because it's a note tweet and the media is handled separately.",
-        "entity_set": {"urls": []},
     }
 
-    # Create Post object
-    post = Post.from_api_data(tweet, legacy, user, note_tweet)
+    first = Post.from_api_data({"rest_id": "1"}, legacy, {"screen_name": "testuser"}, {})
+    second = Post.from_api_data({"rest_id": "1"}, legacy, {"screen_name": "testuser"}, {})
 
-    # Should use the note_tweet text, which doesn't have t.co links
-    assert "t.co" not in post.text
-    assert "This is a long tweet that gets truncated but here's the full text" in post.text
+    assert url_entities == []
+    assert first.text == second.text == "Photo https://pbs.twimg.com/media/pic.jpg"
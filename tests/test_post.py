@@ -1,7 +1,40 @@
-from xtract.models.post import Post, PostData
+import dataclasses
+import io
+import json
+import operator
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+from xtract.models.post import Post, PostData, _parse_created_at
 from xtract.models.user import UserDetails
 
 
+@pytest.fixture(scope="module")
+def default_user():
+    """Author shared by the posts in this module; UserDetails is immutable."""
+    return UserDetails(name="Test User", screen_name="testuser", followers_count=1000)
+
+
+@pytest.fixture(scope="module")
+def default_post_data():
+    """Post metadata shared by the posts in this module; no test modifies it."""
+    return PostData(favorite_count=50, retweet_count=20)
+
+
+@pytest.fixture(scope="module")
+def quoted_user():
+    """Author of the quoted posts in this module."""
+    return UserDetails(name="Quoted User", screen_name="quoteduser")
+
+
+@pytest.fixture(scope="module")
+def quoted_post_data():
+    """Post metadata of the quoted posts in this module."""
+    return PostData(favorite_count=100, retweet_count=30)
+
+
 def test_post_data_initialization():
     """Test PostData initialization with default values."""
     post_data = PostData()
@@ -50,44 +83,41 @@ def test_post_data_from_dict():
     assert post_data.grok_analysis_button is True
 
 
-def test_post_initialization():
-    """Test Post initialization."""
-    user_details = UserDetails(name="Test User", screen_name="testuser", followers_count=1000)
+def test_post_data_to_dict():
+    """Test that PostData.to_dict lists every field, in declaration order."""
+    post_data = PostData(favorite_count=100, lang="en", is_translatable=True)
 
-    post_data = PostData(favorite_count=50, retweet_count=20)
+    post_data_dict = post_data.to_dict()
 
-    post = Post(
-        tweet_id="123456789",
-        username="testuser",
-        created_at="Wed Feb 28 12:00:00 +0000 2024",
-        text="This is a test post",
-        view_count="500",
-        images=["https://example.com/image.jpg"],
-        videos=[],
-        user_details=user_details,
-        post_data=post_data,
+    assert post_data_dict == dataclasses.asdict(post_data)
+    assert list(post_data_dict) == [field.name for field in dataclasses.fields(PostData)]
+
+
+def test_post_data_from_dict_interns_repeated_strings():
+    """Test that lang and source values are shared between PostData instances."""
+    # Build the values at runtime so each call receives a distinct string object
+    first = PostData.from_dict(
+        {"source": " ".join(["Twitter", "Web", "App"])}, {"lang": "".join(["e", "n"])}
+    )
+    second = PostData.from_dict(
+        {"source": " ".join(["Twitter", "Web", "App"])}, {"lang": "".join(["e", "n"])}
     )
 
-    assert post.tweet_id == "123456789"
-    assert post.username == "testuser"
-    assert post.created_at == "Wed Feb 28 12:00:00 +0000 2024"
-    assert post.text == "This is a test post"
-    assert post.view_count == "500"
-    assert len(post.images) == 1
-    assert len(post.videos) == 0
-    assert post.user_details.name == "Test User"
-    assert post.user_details.followers_count == 1000
-    assert post.post_data.favorite_count == 50
-    assert post.post_data.retweet_count == 20
-    assert post.quoted_tweet is None
+    assert first.lang is second.lang
+    assert first.source is second.source
 
 
-def test_post_to_dict():
-    """Test Post to_dict serialization."""
-    user_details = UserDetails(name="Test User", screen_name="testuser", followers_count=1000)
+def test_post_data_from_dict_null_strings():
+    """Test that null lang and source values fall back to empty strings."""
+    post_data = PostData.from_dict({"source": None}, {"lang": None})
 
-    post_data = PostData(favorite_count=50, retweet_count=20)
+    assert post_data.lang == ""
+    assert post_data.source == ""
 
+
+@pytest.mark.parametrize("as_dict", [False, True], ids=["attributes", "to_dict"])
+def test_post_fields(as_dict, default_user, default_post_data):
+    """Test Post initialization and that to_dict exposes the same values."""
     post = Post(
         tweet_id="123456789",
         username="testuser",
@@ -96,36 +126,33 @@ def test_post_to_dict():
         view_count="500",
         images=["https://example.com/image.jpg"],
         videos=[],
-        user_details=user_details,
-        post_data=post_data,
+        user_details=default_user,
+        post_data=default_post_data,
     )
 
-    post_dict = post.to_dict()
-
-    assert post_dict["tweet_id"] == "123456789"
-    assert post_dict["username"] == "testuser"
-    assert post_dict["created_at"] == "Wed Feb 28 12:00:00 +0000 2024"
-    assert post_dict["text"] == "This is a test post"
-    assert post_dict["view_count"] == "500"
-    assert len(post_dict["images"]) == 1
-    assert len(post_dict["videos"]) == 0
-    assert post_dict["user_details"]["name"] == "Test User"
-    assert post_dict["user_details"]["followers_count"] == 1000
-    assert post_dict["post_data"]["favorite_count"] == 50
-    assert post_dict["post_data"]["retweet_count"] == 20
-    assert "quoted_tweet" not in post_dict
-
-
-def test_post_with_quoted_tweet():
-    """Test Post with quoted tweet."""
-    user_details = UserDetails(name="Test User", screen_name="testuser")
-
-    post_data = PostData(favorite_count=50, retweet_count=20)
+    # Read every field the same way from the Post itself or from its dictionary
+    fields = post.to_dict() if as_dict else post
+    get = operator.getitem if as_dict else getattr
 
-    quoted_user = UserDetails(name="Quoted User", screen_name="quoteduser")
+    assert get(fields, "tweet_id") == "123456789"
+    assert get(fields, "username") == "testuser"
+    assert get(fields, "created_at") == "Wed Feb 28 12:00:00 +0000 2024"
+    assert get(fields, "text") == "This is a test post"
+    assert get(fields, "view_count") == "500"
+    assert len(get(fields, "images")) == 1
+    assert len(get(fields, "videos")) == 0
+    assert get(get(fields, "user_details"), "name") == "Test User"
+    assert get(get(fields, "user_details"), "followers_count") == 1000
+    assert get(get(fields, "post_data"), "favorite_count") == 50
+    assert get(get(fields, "post_data"), "retweet_count") == 20
+    if as_dict:
+        assert "quoted_tweet" not in fields
+    else:
+        assert post.quoted_tweet is None
 
-    quoted_post_data = PostData(favorite_count=100, retweet_count=30)
 
+def test_post_with_quoted_tweet(default_user, default_post_data, quoted_user, quoted_post_data):
+    """Test Post with quoted tweet."""
     quoted_post = Post(
         tweet_id="987654321",
         username="quoteduser",
@@ -146,8 +173,8 @@ def test_post_with_quoted_tweet():
         view_count="500",
         images=[],
         videos=[],
-        user_details=user_details,
-        post_data=post_data,
+        user_details=default_user,
+        post_data=default_post_data,
         quoted_tweet=quoted_post,
     )
 
@@ -161,3 +188,106 @@ def test_post_with_quoted_tweet():
     assert post_dict["quoted_tweet"]["tweet_id"] == "987654321"
     assert post_dict["quoted_tweet"]["text"] == "This is a quoted post"
     assert len(post_dict["quoted_tweet"]["videos"]) == 1
+
+
+def test_post_created_at_datetime(sample_post):
+    """Test that created_at is exposed as a parsed, cached datetime."""
+    created = sample_post.created_at_datetime
+
+    assert created == datetime(2024, 2, 28, 12, 0, tzinfo=timezone.utc)
+    assert sample_post.created_at_datetime is created
+
+    sample_post.created_at = "not a date"
+    assert sample_post.created_at_datetime is None
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        "Mon Jan 01 00:00:00 +0000 2024",
+        "Sat Dec 31 23:59:59 +0530 2022",
+        "Thu Sep 05 07:08:09 -0500 2019",
+        "Thu Feb 29 12:00:00 +0000 2024",
+    ],
+)
+def test_parse_created_at_matches_strptime(created_at):
+    """Test that the fast path agrees with strptime across offsets and months."""
+    _parse_created_at.cache_clear()
+
+    parsed = _parse_created_at(created_at)
+
+    expected = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        "Fri Feb 30 12:00:00 +0000 2024",
+        "Thu Feb 29 12:00:00 +0000 2023",
+        "Wed Feb 00 12:00:00 +0000 2024",
+        "Wed Feb 28 99:99:99 +0000 2024",
+        "Wed Feb 28 24:00:00 +0000 2024",
+        "Wed Feb 28 12:60:00 +0000 2024",
+        "Wed Feb 28 12:00:60 +0000 2024",
+        "Wed Feb 28 12:00:00 +9900 2024",
+        "Wed Feb 28 12:00:00 +0060 2024",
+        "Wed Feb 28 12:00:00 +00ab 2024",
+        "Xyz Feb 28 12:00:00 +0000 2024",
+        "Wed Feb 28 12:00:00 +0000 0000",
+        "Wed_Feb 28 12:00:00 +0000 2024",
+    ],
+)
+def test_parse_created_at_invalid_fields_match_strptime(created_at):
+    """Test that out-of-range fields are rejected like strptime rejects them."""
+    _parse_created_at.cache_clear()
+
+    with pytest.raises(ValueError):
+        datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+    assert _parse_created_at(created_at) is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+def test_post_uses_slots(sample_post):
+    """Test that Post and PostData instances carry no per-instance __dict__."""
+    assert not hasattr(sample_post, "__dict__")
+    assert not hasattr(sample_post.post_data, "__dict__")
+    with pytest.raises(AttributeError):
+        sample_post.unknown_field = "value"
+
+
+def test_post_write_json_matches_to_dict(
+    default_user, default_post_data, quoted_user, quoted_post_data
+):
+    """Test that write_json streams the same document as to_dict."""
+    quoted_post = Post(
+        tweet_id="987654321",
+        username="quoteduser",
+        created_at="Wed Feb 28 11:00:00 +0000 2024",
+        text='Quoted post with \u00e9motes \u2014 and "quotes"\nacross lines',
+        view_count="1000",
+        images=[],
+        videos=["https://example.com/video.mp4"],
+        user_details=quoted_user,
+        post_data=quoted_post_data,
+    )
+
+    post = Post(
+        tweet_id="123456789",
+        username="testuser",
+        created_at="Wed Feb 28 12:00:00 +0000 2024",
+        text="This is a test post with quote",
+        view_count="500",
+        images=["https://example.com/image.jpg"],
+        videos=[],
+        user_details=default_user,
+        post_data=default_post_data,
+        quoted_tweet=quoted_post,
+        quoted_tweet_id="987654321",
+    )
+
+    for kwargs in ({}, {"indent": 2}, {"indent": 2, "ensure_ascii": False}):
+        buffer = io.StringIO()
+        post.write_json(buffer, **kwargs)
+        assert buffer.getvalue() == json.dumps(post.to_dict(), **kwargs)
@@ -1,16 +1,21 @@
-import json
+import logging
 import os
 import pytest
 
 from xtract.models.post import Post
+from xtract.utils.serialization import loads
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def quoted_tweet_response():
-    """Load the quoted tweet response fixture."""
+    """
+    Load the quoted tweet response fixture.
+
+    Loaded once per module; tests copy any part of it they modify.
+    """
     fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "quoted_tweet_response.json")
-    with open(fixture_path, "r") as f:
-        return json.load(f)
+    with open(fixture_path, "rb") as f:
+        return loads(f.read())
 
 
 def test_quoted_tweet_included(quoted_tweet_response):
@@ -398,3 +403,19 @@ def test_quotedRefResult_detection():
     assert level1.quoted_tweet_id == "333333"
     # But should not have the full quoted_tweet since only ID was in quotedRefResult
     # (This would be fetched by recursive fetching in the real implementation)
+
+
+def test_debug_logging_reports_quoted_tweet(quoted_tweet_response, caplog):
+    """Test that the debug diagnostics are logged only when DEBUG is enabled."""
+    tweet_data = quoted_tweet_response["data"]["tweetResult"]["result"]
+    legacy = tweet_data.get("legacy", {})
+    user = tweet_data.get("core", {}).get("user_results", {}).get("result", {}).get("legacy", {})
+
+    with caplog.at_level(logging.INFO, logger="xtract"):
+        Post.from_api_data(tweet_data, legacy, user, {})
+    assert "Found quoted tweet with full data" not in caplog.text
+
+    with caplog.at_level(logging.DEBUG, logger="xtract"):
+        post = Post.from_api_data(tweet_data, legacy, user, {})
+    assert f"Created Post from API data for tweet ID: {post.tweet_id}" in caplog.text
+    assert f"Found quoted tweet with full data, ID: {post.quoted_tweet_id}" in caplog.text
@@ -1,3 +1,8 @@
+import dataclasses
+import sys
+
+import pytest
+
 from xtract.models.user import UserDetails
 
 
@@ -112,3 +117,38 @@ def test_user_details_from_dict_missing_values():
     assert user.listed_count == 0
     assert user.is_verified is False
     assert user.is_blue_verified is False
+
+
+def test_user_details_is_immutable_and_hashable():
+    """Test that UserDetails can be shared and used as a dictionary key."""
+    user = UserDetails(name="Test User", screen_name="testuser")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        user.name = "Other User"
+
+    assert {user: 1}[UserDetails(name="Test User", screen_name="testuser")] == 1
+    if sys.version_info >= (3, 10):
+        assert not hasattr(user, "__dict__")
+
+
+def test_user_details_to_dict():
+    """Test UserDetails conversion to dictionary."""
+    user = UserDetails(name="Test User", screen_name="testuser", followers_count=10)
+
+    user_dict = user.to_dict()
+
+    assert user_dict == dataclasses.asdict(user)
+    assert list(user_dict) == [field.name for field in dataclasses.fields(UserDetails)]
+
+
+def test_user_details_from_dict_shares_identical_authors():
+    """Test that identical author data yields one shared UserDetails instance."""
+    user_data = {"name": "Test User", "screen_name": "testuser", "followers_count": 1000}
+
+    first = UserDetails.from_dict(user_data)
+    second = UserDetails.from_dict(dict(user_data))
+    changed = UserDetails.from_dict({**user_data, "followers_count": 1001})
+
+    assert first is second
+    assert changed is not first
+    assert changed.followers_count == 1001
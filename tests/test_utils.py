@@ -1,148 +1,331 @@
 import os
-import tempfile
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, mock_open
 
-from xtract.utils.file import ensure_directory, save_json
+from xtract.utils.file import _FILE_MODE, ensure_directory, load_json, save_json, save_post_json
 from xtract.utils.media import extract_media_urls
+from xtract.utils.serialization import dumps, loads
 
 
-def test_ensure_directory_new():
+def test_ensure_directory_new(tmp_path):
     """Test creating a new directory."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        new_dir = os.path.join(temp_dir, "new_dir")
+    temp_dir = str(tmp_path)
+    new_dir = os.path.join(temp_dir, "new_dir")
 
-        # Directory shouldn't exist yet
-        assert not os.path.exists(new_dir)
+    # Directory shouldn't exist yet
+    assert not os.path.exists(new_dir)
 
-        # Create the directory
-        ensure_directory(new_dir)
+    # Create the directory
+    ensure_directory(new_dir)
 
-        # Directory should now exist
-        assert os.path.exists(new_dir)
-        assert os.path.isdir(new_dir)
+    # Directory should now exist
+    assert os.path.exists(new_dir)
+    assert os.path.isdir(new_dir)
 
 
-def test_ensure_directory_existing():
+def test_ensure_directory_existing(tmp_path):
     """Test ensuring an existing directory."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Directory already exists
-        assert os.path.exists(temp_dir)
+    temp_dir = str(tmp_path)
+    # Directory already exists
+    assert os.path.exists(temp_dir)
 
-        # Should not raise an error
-        ensure_directory(temp_dir)
+    # Should not raise an error
+    ensure_directory(temp_dir)
 
-        # Directory should still exist
-        assert os.path.exists(temp_dir)
-        assert os.path.isdir(temp_dir)
+    # Directory should still exist
+    assert os.path.exists(temp_dir)
+    assert os.path.isdir(temp_dir)
 
 
-@patch("builtins.open", new_callable=mock_open)
-@patch("json.dump")
-def test_save_json(mock_json_dump, mock_file):
+def test_ensure_directory_relative_path_after_chdir(tmp_path, monkeypatch):
+    """Test that a relative path is ensured again after changing directory."""
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    monkeypatch.chdir(first)
+    ensure_directory("out")
+    monkeypatch.chdir(second)
+    ensure_directory("out")
+
+    assert (first / "out").is_dir()
+    assert (second / "out").is_dir()
+
+
+def test_ensure_directory_recreates_removed_directory(tmp_path):
+    """Test that a directory deleted after being ensured is created again."""
+    new_dir = tmp_path / "out"
+    ensure_directory(new_dir)
+    new_dir.rmdir()
+
+    ensure_directory(new_dir)
+
+    assert new_dir.is_dir()
+
+
+def test_save_json(tmp_path):
     """Test saving JSON data to a file."""
     data = {"key": "value", "nested": {"sub": "data"}}
-    filepath = "/tmp/test.json"
+    filepath = tmp_path / "test.json"
+    filepath.write_bytes(b"previous contents")
 
-    save_json(data, filepath)
+    save_json(data, str(filepath))
 
-    mock_file.assert_called_once_with(filepath, "w", encoding="utf-8")
-    mock_json_dump.assert_called_once()
-    # Check that the first positional argument to json.dump is the data
-    assert mock_json_dump.call_args[0][0] == data
-    # Check that the indent parameter is set for pretty printing
-    assert mock_json_dump.call_args[1].get("indent") == 2
+    # Output is pretty-printed by default and replaces the previous file
+    assert (
+        filepath.read_bytes() == b'{\n  "key": "value",\n  "nested": {\n    "sub": "data"\n  }\n}'
+    )
+    # The temporary file was moved into place
+    assert os.listdir(tmp_path) == ["test.json"]
 
 
-def test_extract_media_urls_no_media():
-    """Test extracting media URLs with no media."""
-    media = []
-    images, videos = extract_media_urls(media)
+def test_save_json_compact(tmp_path):
+    """Test saving compact JSON data to a file."""
+    data = {"key": "value", "nested": {"sub": "data"}}
+    filepath = tmp_path / "test.json"
 
-    assert images == []
-    assert videos == []
+    save_json(data, filepath, pretty=False)
 
+    assert filepath.read_bytes() == b'{"key":"value","nested":{"sub":"data"}}'
 
-def test_extract_media_urls_images_only():
-    """Test extracting media URLs with only images."""
-    media = [
-        {"type": "photo", "media_url_https": "https://example.com/image1.jpg"},
-        {"type": "photo", "media_url_https": "https://example.com/image2.jpg"},
-    ]
 
-    images, videos = extract_media_urls(media)
+def test_save_json_concurrent_saves_to_same_path(tmp_path):
+    """Test that concurrent saves to one path each use their own temporary file."""
+    filepath = tmp_path / "test.json"
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda i: save_json({"writer": i}, filepath), range(200)))
+
+    assert load_json(filepath)["writer"] in range(200)
+    assert os.listdir(tmp_path) == ["test.json"]
+
+
+def test_save_json_leaves_unrelated_tmp_file_alone(tmp_path):
+    """Test that an existing <name>.tmp file is not overwritten or removed."""
+    filepath = tmp_path / "test.json"
+    user_file = tmp_path / "test.json.tmp"
+    user_file.write_bytes(b"user data")
+
+    save_json({"key": "value"}, filepath)
+
+    assert user_file.read_bytes() == b"user data"
+    assert sorted(os.listdir(tmp_path)) == ["test.json", "test.json.tmp"]
+
+
+def test_save_json_uses_default_file_mode(tmp_path):
+    """Test that saved files get the umask-based mode rather than mkstemp's 0600."""
+    filepath = tmp_path / "test.json"
 
-    assert len(images) == 2
-    assert "https://example.com/image1.jpg" in images
-    assert "https://example.com/image2.jpg" in images
-    assert videos == []
-
-
-def test_extract_media_urls_videos_only():
-    """Test extracting media URLs with only videos."""
-    media = [
-        {
-            "type": "video",
-            "video_info": {
-                "variants": [
-                    {
-                        "content_type": "video/mp4",
-                        "url": "https://example.com/video1_low.mp4",
-                        "bitrate": 256000,
+    save_json({"key": "value"}, filepath)
+
+    assert filepath.stat().st_mode & 0o777 == _FILE_MODE
+
+
+def test_save_json_unserializable_keeps_existing_file(tmp_path):
+    """Test that a failed save leaves the previous file and no temporary file."""
+    filepath = tmp_path / "test.json"
+    filepath.write_bytes(b"previous contents")
+
+    with pytest.raises(TypeError):
+        save_json({"key": object()}, filepath)
+
+    assert filepath.read_bytes() == b"previous contents"
+    assert os.listdir(tmp_path) == ["test.json"]
+
+
+@patch("builtins.open", new_callable=mock_open, read_data=b'{"a": 1}')
+def test_load_json(mock_file):
+    """Test loading JSON data from a file as bytes."""
+    with patch("xtract.utils.file.loads", wraps=loads) as mock_loads:
+        assert load_json("/tmp/test.json") == {"a": 1}
+
+    mock_file.assert_called_once_with("/tmp/test.json", "rb")
+    mock_loads.assert_called_once_with(b'{"a": 1}')
+
+
+def test_load_json_round_trip(tmp_path):
+    """Test that load_json reads back what save_json wrote."""
+    data = {"key": "caf\u00e9", "nested": [1, 2, {"sub": None}]}
+    filepath = str(tmp_path / "data.json")
+
+    save_json(data, filepath)
+
+    assert load_json(filepath) == data
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_save_post_json_matches_save_json(sample_post, tmp_path, has_orjson):
+    """Test that both save_post_json code paths write what save_json would."""
+    sample_post.text = "Caf\u00e9 \u2014 post"
+    expected = tmp_path / "expected.json"
+    actual = tmp_path / "actual.json"
+    save_json(sample_post.to_dict(), str(expected))
+
+    with patch("xtract.utils.file.HAS_ORJSON", has_orjson):
+        save_post_json(sample_post, actual)
+
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_save_post_json_failure_keeps_existing_file(sample_post, tmp_path, has_orjson):
+    """Test that a post that fails to serialize does not clobber the previous file."""
+    sample_post.text = object()
+    filepath = tmp_path / "tweet.json"
+    filepath.write_bytes(b"previous contents")
+
+    with patch("xtract.utils.file.HAS_ORJSON", has_orjson), pytest.raises(TypeError):
+        save_post_json(sample_post, filepath)
+
+    assert filepath.read_bytes() == b"previous contents"
+    assert os.listdir(tmp_path) == ["tweet.json"]
+
+
+def test_dumps_keeps_unicode():
+    """Test that non-ASCII text is written as UTF-8 instead of escaped."""
+    data = {"text": "café ✓", 1: "non-string key"}
+
+    compact = dumps(data)
+    pretty = dumps(data, indent=True)
+
+    assert "café ✓".encode("utf-8") in compact
+    assert b"\n" not in compact
+    assert pretty.startswith(b'{\n  "text"')
+    assert loads(pretty) == {"text": "café ✓", "1": "non-string key"}
+
+
+@pytest.mark.parametrize(
+    "media, expected_images, expected_videos",
+    [
+        pytest.param([], [], [], id="no_media"),
+        pytest.param(None, [], [], id="media_is_none"),
+        pytest.param(
+            [
+                {"type": "photo", "media_url_https": "https://example.com/image1.jpg"},
+                {"type": "photo", "media_url_https": "https://example.com/image2.jpg"},
+            ],
+            ["https://example.com/image1.jpg", "https://example.com/image2.jpg"],
+            [],
+            id="images_only",
+        ),
+        # Should choose the highest bitrate
+        pytest.param(
+            [
+                {
+                    "type": "video",
+                    "video_info": {
+                        "variants": [
+                            {
+                                "content_type": "video/mp4",
+                                "url": "https://example.com/video1_low.mp4",
+                                "bitrate": 256000,
+                            },
+                            {
+                                "content_type": "video/mp4",
+                                "url": "https://example.com/video1_high.mp4",
+                                "bitrate": 832000,
+                            },
+                        ]
                     },
-                    {
-                        "content_type": "video/mp4",
-                        "url": "https://example.com/video1_high.mp4",
-                        "bitrate": 832000,
+                }
+            ],
+            [],
+            ["https://example.com/video1_high.mp4"],
+            id="videos_only",
+        ),
+        # Playlist variants without a bitrate lose to MP4 variants
+        pytest.param(
+            [
+                {
+                    "type": "animated_gif",
+                    "video_info": {
+                        "variants": [
+                            {
+                                "content_type": "application/x-mpegURL",
+                                "url": "https://example.com/playlist.m3u8",
+                            },
+                            {
+                                "content_type": "video/mp4",
+                                "url": "https://example.com/gif.mp4",
+                                "bitrate": 0,
+                            },
+                            {
+                                "content_type": "video/mp4",
+                                "url": "https://example.com/gif_high.mp4",
+                                "bitrate": 1000,
+                            },
+                        ]
                     },
-                ]
-            },
-        }
-    ]
-
+                },
+                {"type": "video", "video_info": {"variants": []}},
+            ],
+            [],
+            ["https://example.com/gif_high.mp4"],
+            id="variant_without_bitrate",
+        ),
+        pytest.param(
+            [
+                {"type": "photo", "media_url_https": "https://example.com/image1.jpg"},
+                {
+                    "type": "video",
+                    "video_info": {
+                        "variants": [
+                            {
+                                "content_type": "video/mp4",
+                                "url": "https://example.com/video1.mp4",
+                                "bitrate": 832000,
+                            }
+                        ]
+                    },
+                },
+                {
+                    "type": "animated_gif",
+                    "video_info": {"variants": [{"url": "https://example.com/gif1.mp4"}]},
+                },
+            ],
+            ["https://example.com/image1.jpg"],
+            ["https://example.com/video1.mp4", "https://example.com/gif1.mp4"],
+            id="mixed_media",
+        ),
+        pytest.param(
+            [{"type": "unsupported", "media_url_https": "https://example.com/unsupported.xyz"}],
+            [],
+            [],
+            id="unsupported_type",
+        ),
+    ],
+)
+def test_extract_media_urls(media, expected_images, expected_videos):
+    """Test extracting image and video URLs from media items."""
     images, videos = extract_media_urls(media)
 
-    assert images == []
-    assert len(videos) == 1
-    # Should choose the highest bitrate
-    assert videos[0] == "https://example.com/video1_high.mp4"
-
-
-def test_extract_media_urls_mixed_media():
-    """Test extracting media URLs with mixed media types."""
-    media = [
-        {"type": "photo", "media_url_https": "https://example.com/image1.jpg"},
-        {
-            "type": "video",
-            "video_info": {
-                "variants": [
-                    {
-                        "content_type": "video/mp4",
-                        "url": "https://example.com/video1.mp4",
-                        "bitrate": 832000,
-                    }
-                ]
-            },
-        },
-        {
-            "type": "animated_gif",
-            "video_info": {"variants": [{"url": "https://example.com/gif1.mp4"}]},
-        },
-    ]
+    # URLs keep the order of the media items
+    assert images == expected_images
+    assert videos == expected_videos
 
-    images, videos = extract_media_urls(media)
 
-    assert len(images) == 1
-    assert images[0] == "https://example.com/image1.jpg"
-    assert len(videos) == 2
-    assert "https://example.com/video1.mp4" in videos
-    assert "https://example.com/gif1.mp4" in videos
+def test_extract_media_urls_returns_fresh_lists():
+    """Test that each call returns new lists that callers may mutate."""
+    images, videos = extract_media_urls([])
+    images.append("https://example.com/image.jpg")
 
+    assert extract_media_urls([]) == ([], [])
 
-def test_extract_media_urls_unsupported_type():
-    """Test extracting media URLs with unsupported media types."""
-    media = [{"type": "unsupported", "media_url_https": "https://example.com/unsupported.xyz"}]
 
-    images, videos = extract_media_urls(media)
+def test_loads_bytes_and_str():
+    """Test parsing JSON from both raw bytes and text."""
+    expected = {"text": "caf\u00e9", "count": 3, "nested": {"items": [1, 2]}}
+
+    assert loads('{"text": "caf\u00e9", "count": 3, "nested": {"items": [1, 2]}}') == expected
+    assert (
+        loads('{"text": "café", "count": 3, "nested": {"items": [1, 2]}}'.encode("utf-8"))
+        == expected
+    )
+
 
-    assert images == []
-    assert videos == []
+def test_loads_invalid_json():
+    """Test that invalid JSON raises ValueError."""
+    with pytest.raises(ValueError):
+        loads(b"not json")